@@ -1,10 +1,20 @@
+import time
+import threading
 import mysql.connector
 from mysql.connector import Error
 from contextlib import contextmanager
+from collections import namedtuple
 
 class Database:
     _instance = None
     _connection = None
+    _prepared = {}
+    _last_used = 0.0
+    # Connections for background threads; the shared one belongs to the UI thread
+    _local = threading.local()
+    
+    # is_connected() pings the server, so it only runs after this many idle seconds
+    PING_INTERVAL = 30
     
     DB_CONFIG = {
         'host': 'localhost',
@@ -35,6 +45,8 @@ class Database:
             temp_conn.close()
             
             Database._connection = mysql.connector.connect(**self.DB_CONFIG)
+            # Prepared statements belong to the old connection
+            Database._prepared = {}
             print("Database connection established successfully")
             return True
             
@@ -42,12 +54,50 @@ class Database:
             print(f"Error connecting to database: {e}")
             return False
     
+    def create_connection(self):
+        return mysql.connector.connect(**self.DB_CONFIG)
+    
     @property
     def connection(self):
-        if Database._connection is None or not Database._connection.is_connected():
+        if threading.current_thread() is not threading.main_thread():
+            return self._thread_connection()
+        now = time.monotonic()
+        if Database._connection is None or (
+            now - Database._last_used > self.PING_INTERVAL
+            and not Database._connection.is_connected()
+        ):
             self.connect()
+        Database._last_used = now
         return Database._connection
     
+    def _thread_connection(self):
+        # Each worker thread lazily opens and keeps its own connection
+        local = Database._local
+        now = time.monotonic()
+        conn = getattr(local, 'connection', None)
+        if conn is None or (
+            now - local.last_used > self.PING_INTERVAL
+            and not conn.is_connected()
+        ):
+            conn = local.connection = self.create_connection()
+            local.prepared = {}
+        local.last_used = now
+        return conn
+    
+    def _statements(self):
+        # Prepared cursors are tied to the connection of the calling thread
+        if threading.current_thread() is not threading.main_thread():
+            self._thread_connection()
+            return Database._local.prepared
+        return Database._prepared
+    
+    def _connection_failed(self):
+        # Force a ping (and reconnect if needed) on the next access
+        if threading.current_thread() is not threading.main_thread():
+            Database._local.last_used = 0.0
+        else:
+            Database._last_used = 0.0
+    
     @contextmanager
     def get_cursor(self, dictionary=True):
         cursor = None
@@ -56,25 +106,111 @@ class Database:
             yield cursor
             self.connection.commit()
         except Error as e:
+            self._connection_failed()
             self.connection.rollback()
             raise e
         finally:
             if cursor:
                 cursor.close()
     
-    def execute_query(self, query, params=None, fetch_one=False, fetch_all=True):
+    def execute_query(self, query, params=None, fetch_one=False, fetch_all=True, row_factory='dict'):
+        # row_factory='ntuple' returns lightweight namedtuple rows instead of dicts
+        ntuple = row_factory == 'ntuple'
         try:
-            with self.get_cursor() as cursor:
+            with self.get_cursor(dictionary=not ntuple) as cursor:
                 cursor.execute(query, params or ())
                 if fetch_one:
-                    return cursor.fetchone()
+                    row = cursor.fetchone()
+                    if ntuple and row is not None:
+                        return self._row_class(cursor)._make(row)
+                    return row
                 elif fetch_all:
-                    return cursor.fetchall()
+                    rows = cursor.fetchall()
+                    if ntuple:
+                        return list(map(self._row_class(cursor)._make, rows))
+                    return rows
                 return None
         except Error as e:
             print(f"Query error: {e}")
             return None
     
+    def iter_query(self, query, params=None, arraysize=1000, row_factory='dict'):
+        # Rows are streamed off the shared connection, so the generator must be
+        # exhausted before any other query is issued.
+        # The connection is captured once: the connection property may ping after
+        # an idle gap, and a ping with a result still pending fails and reconnects.
+        ntuple = row_factory == 'ntuple'
+        conn = self.connection
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=not ntuple)
+            cursor.execute(query, params or ())
+            make_row = self._row_class(cursor)._make if ntuple else None
+            try:
+                while True:
+                    rows = cursor.fetchmany(arraysize)
+                    if not rows:
+                        break
+                    if make_row:
+                        rows = map(make_row, rows)
+                    yield from rows
+            finally:
+                if conn.unread_result:
+                    cursor.fetchall()
+            conn.commit()
+        except Error as e:
+            self._connection_failed()
+            try:
+                conn.rollback()
+            except Error:
+                pass
+            print(f"Query error: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+    
+    def execute_prepared(self, query, params=None, fetch_one=False):
+        # Server-side prepared statement, one cursor per SQL string: repeat calls
+        # only send the parameters instead of having MySQL re-parse the query.
+        prepared = self._statements()
+        cursor = prepared.get(query)
+        try:
+            if cursor is None:
+                cursor = self.connection.cursor(prepared=True)
+                prepared[query] = cursor
+            cursor.execute(query, params or ())
+            columns = cursor.column_names
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            self.connection.commit()
+            if fetch_one:
+                return rows[0] if rows else None
+            return rows
+        except Error as e:
+            prepared.pop(query, None)
+            self._connection_failed()
+            print(f"Query error: {e}")
+            return None
+    
+    def execute_prepared_update(self, query, params=None):
+        # Write counterpart of execute_prepared; returns the affected row count
+        prepared = self._statements()
+        cursor = prepared.get(query)
+        try:
+            if cursor is None:
+                cursor = self.connection.cursor(prepared=True)
+                prepared[query] = cursor
+            cursor.execute(query, params or ())
+            self.connection.commit()
+            return cursor.rowcount
+        except Error as e:
+            prepared.pop(query, None)
+            self._connection_failed()
+            print(f"Update error: {e}")
+            return -1
+    
+    def _row_class(self, cursor):
+        return namedtuple('Row', cursor.column_names, rename=True)
+    
     def execute_insert(self, query, params=None):
         try:
             with self.get_cursor() as cursor:
@@ -84,6 +220,17 @@ class Database:
             print(f"Insert error: {e}")
             return None
     
+    def execute_insert_new(self, query, params=None):
+        # For INSERT ... ON DUPLICATE KEY UPDATE: the new id when a row was
+        # inserted (rowcount 1), None when the key already existed.
+        try:
+            with self.get_cursor() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.lastrowid if cursor.rowcount == 1 else None
+        except Error as e:
+            print(f"Insert error: {e}")
+            return None
+    
     def execute_update(self, query, params=None):
         try:
             with self.get_cursor() as cursor:
@@ -151,6 +298,7 @@ class Database:
     
     def close(self):
         if Database._connection and Database._connection.is_connected():
+            Database._prepared = {}
             Database._connection.close()
             Database._connection = None
     
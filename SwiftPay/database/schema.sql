@@ -15,7 +15,8 @@ CREATE TABLE IF NOT EXISTS users (
     role ENUM('Admin', 'Staff') NOT NULL DEFAULT 'Staff',
     status ENUM('Active', 'Inactive') NOT NULL DEFAULT 'Active',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_users_login (username, status, password_hash, full_name, role)
 );
 
 -- =====================================================
@@ -41,7 +42,8 @@ CREATE TABLE IF NOT EXISTS employees (
     status ENUM('Active', 'Inactive') NOT NULL DEFAULT 'Active',
     date_hired DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_emp_name (last_name, first_name)
 );
 
 -- =====================================================
@@ -62,7 +64,9 @@ CREATE TABLE IF NOT EXISTS attendance (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (employee_id) REFERENCES employees(employee_id) ON DELETE CASCADE,
-    UNIQUE KEY unique_attendance (employee_id, attendance_date)
+    UNIQUE KEY unique_attendance (employee_id, attendance_date),
+    INDEX idx_att_emp_date_status (employee_id, attendance_date, status, hours_worked, overtime_hours, late_minutes),
+    INDEX idx_att_date_emp (attendance_date, employee_id)
 );
 
 -- =====================================================
@@ -82,7 +86,9 @@ CREATE TABLE IF NOT EXISTS payroll (
     processed_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (processed_by) REFERENCES users(user_id)
+    FOREIGN KEY (processed_by) REFERENCES users(user_id),
+    INDEX idx_payroll_start_status (start_date, status),
+    INDEX idx_payroll_status (status)
 );
 
 -- =====================================================
@@ -204,3 +210,17 @@ CREATE TABLE IF NOT EXISTS audit_log (
     INDEX idx_created_at (created_at)
 );
 
+
+-- =====================================================
+-- TRIGGER: audit user creation in the same transaction
+-- The acting user is read from @current_user_id, set by UserManager
+-- =====================================================
+CREATE TRIGGER IF NOT EXISTS trg_users_audit_create
+AFTER INSERT ON users
+FOR EACH ROW
+INSERT INTO audit_log (user_id, action_type, entity_type, entity_id, action_description, new_values)
+SELECT @current_user_id, 'CREATE', 'USER', NEW.user_id,
+       CONCAT('Created new user ''', NEW.username, ''' with role ''', NEW.role, ''''),
+       JSON_OBJECT('username', NEW.username, 'full_name', NEW.full_name, 'role', NEW.role)
+FROM DUAL
+WHERE @current_user_id IS NOT NULL;
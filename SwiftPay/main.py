@@ -38,6 +38,76 @@ def create_audit_log_table(db):
         print(f"✗ Error creating audit_log table: {e}")
 
 
+def create_user_audit_trigger(db):
+    create_trigger_query = """
+        CREATE TRIGGER trg_users_audit_create
+        AFTER INSERT ON users
+        FOR EACH ROW
+        INSERT INTO audit_log (user_id, action_type, entity_type, entity_id, action_description, new_values)
+        SELECT @current_user_id, 'CREATE', 'USER', NEW.user_id,
+               CONCAT('Created new user ''', NEW.username, ''' with role ''', NEW.role, ''''),
+               JSON_OBJECT('username', NEW.username, 'full_name', NEW.full_name, 'role', NEW.role)
+        FROM DUAL
+        WHERE @current_user_id IS NOT NULL
+    """
+    try:
+        db.execute_update(create_trigger_query)
+    except Exception as e:
+        print(f"✗ Error creating users audit trigger: {e}")
+        return False
+    
+    if not user_audit_trigger_exists(db):
+        print("✗ Error creating users audit trigger; user creation is audited from Python")
+        return False
+    print("✓ users audit trigger created successfully")
+    return True
+
+
+def user_audit_trigger_exists(db):
+    query = """
+        SELECT COUNT(*) as count
+        FROM information_schema.triggers
+        WHERE trigger_schema = %s AND trigger_name = 'trg_users_audit_create'
+    """
+    result = db.execute_query(query, (db.DB_CONFIG['database'],), fetch_one=True)
+    return result and result.get('count', 0) > 0
+
+
+# Indexes added to schema.sql after release. CREATE TABLE IF NOT EXISTS never
+# touches an existing table, so initialize_database creates any that are missing.
+SCHEMA_INDEXES = (
+    ('users', 'idx_users_login', '(username, status, password_hash, full_name, role)'),
+    ('attendance', 'idx_att_date_emp', '(attendance_date, employee_id)'),
+    ('payroll', 'idx_payroll_status', '(status)'),
+    ('payroll', 'idx_payroll_start_status', '(start_date, status)'),
+    ('employees', 'idx_emp_name', '(last_name, first_name)'),
+    ('attendance', 'idx_att_emp_date_status', '(employee_id, attendance_date, status, hours_worked, overtime_hours, late_minutes)'),
+)
+
+
+def existing_indexes(db):
+    query = """
+        SELECT DISTINCT table_name AS table_name, index_name AS index_name
+        FROM information_schema.statistics
+        WHERE table_schema = %s
+    """
+    rows = db.execute_query(query, (db.DB_CONFIG['database'],)) or []
+    return {(row['table_name'], row['index_name']) for row in rows}
+
+
+def create_missing_indexes(db):
+    existing = existing_indexes(db)
+    for table, index_name, columns in SCHEMA_INDEXES:
+        if (table, index_name) in existing:
+            continue
+        print(f"Creating missing index {index_name}...")
+        try:
+            db.execute_update(f"CREATE INDEX {index_name} ON {table} {columns}")
+            print(f"✓ {index_name} index created successfully")
+        except Exception as e:
+            print(f"✗ Error creating {index_name} index: {e}")
+
+
 def initialize_database():
     try:
         from database.db import db
@@ -50,8 +120,16 @@ def initialize_database():
             if not db.table_exists('audit_log'):
                 print("Creating missing audit_log table...")
                 create_audit_log_table(db)
+            
+            create_missing_indexes(db)
+        
+        has_audit_trigger = user_audit_trigger_exists(db)
+        if not has_audit_trigger:
+            print("Creating missing users audit trigger...")
+            has_audit_trigger = create_user_audit_trigger(db)
         
         from modules.users import user_manager
+        user_manager.audit_trigger = bool(has_audit_trigger)
         user_manager.initialize_admin()
         
         return True
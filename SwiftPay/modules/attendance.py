@@ -3,14 +3,10 @@ SwiftPay Attendance Management Module
 Handles time-in/out, attendance tracking, and calculations
 """
 
-import sys
-import os
 from datetime import datetime, timedelta, time
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
-from modules.audit_log import audit_logger, AuditLogger
+from .audit_log import audit_logger, AuditLogger
 
 
 class AttendanceManager:
@@ -73,6 +69,9 @@ class AttendanceManager:
             """
             attendance_id = self.db.execute_insert(query, (employee_id, date, time_in, late_minutes))
         
+        if attendance_id:
+            self._invalidate_report_cache()
+        
         # Log time-in
         if attendance_id and user_id:
             from modules.employees import employee_manager
@@ -143,6 +142,9 @@ class AttendanceManager:
             (time_out, hours_worked, overtime_hours, undertime, attendance['attendance_id'])
         )
         
+        if result > 0:
+            self._invalidate_report_cache()
+        
         # Log time-out
         if result > 0 and user_id:
             from modules.employees import employee_manager
@@ -159,6 +161,58 @@ class AttendanceManager:
             return self.get_attendance(employee_id, date)
         return None
     
+    def upsert_attendance(self, employee_id, date, time_in, time_out, status='Present', remarks=None):
+        """
+        Record a full day's attendance in a single write.
+        
+        Late minutes and hours are calculated up front, so the row is
+        inserted (or an existing row for that day replaced) with one
+        INSERT ... ON DUPLICATE KEY UPDATE instead of separate time-in
+        and time-out round trips.
+        
+        Args:
+            employee_id: ID of employee
+            date: Date of attendance
+            time_in: Time of arrival
+            time_out: Time of departure
+            status: Attendance status
+            remarks: Optional remarks
+            
+        Returns:
+            Attendance record ID if successful, None otherwise
+        """
+        late_minutes = self.calculate_late_minutes(time_in)
+        hours_worked, overtime_hours, undertime = self.calculate_hours(
+            time_in, time_out, date_in=date, date_out=date
+        )
+        
+        # LAST_INSERT_ID(attendance_id) makes lastrowid the existing row's ID on update
+        query = """
+            INSERT INTO attendance (employee_id, attendance_date, time_in, time_out,
+                                    hours_worked, overtime_hours, late_minutes,
+                                    undertime_minutes, status, remarks)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                attendance_id = LAST_INSERT_ID(attendance_id),
+                time_in = VALUES(time_in),
+                time_out = VALUES(time_out),
+                hours_worked = VALUES(hours_worked),
+                overtime_hours = VALUES(overtime_hours),
+                late_minutes = VALUES(late_minutes),
+                undertime_minutes = VALUES(undertime_minutes),
+                status = VALUES(status),
+                remarks = VALUES(remarks)
+        """
+        attendance_id = self.db.execute_insert(query, (
+            employee_id, date, time_in, time_out,
+            hours_worked, overtime_hours, late_minutes,
+            undertime, status, remarks
+        ))
+        
+        if attendance_id:
+            self._invalidate_report_cache()
+        return attendance_id
+    
     def calculate_late_minutes(self, time_in):
         """
         Calculate late minutes based on standard time-in.
@@ -272,13 +326,16 @@ class AttendanceManager:
                 WHERE attendance_id = %s
             """
             self.db.execute_update(query, (remarks, existing['attendance_id']))
-            return existing['attendance_id']
+            attendance_id = existing['attendance_id']
         else:
             query = """
                 INSERT INTO attendance (employee_id, attendance_date, status, remarks)
                 VALUES (%s, %s, 'Absent', %s)
             """
-            return self.db.execute_insert(query, (employee_id, date, remarks))
+            attendance_id = self.db.execute_insert(query, (employee_id, date, remarks))
+        
+        self._invalidate_report_cache()
+        return attendance_id
     
     def record_leave(self, employee_id, date, remarks=None):
         """
@@ -301,13 +358,16 @@ class AttendanceManager:
                 WHERE attendance_id = %s
             """
             self.db.execute_update(query, (remarks, existing['attendance_id']))
-            return existing['attendance_id']
+            attendance_id = existing['attendance_id']
         else:
             query = """
                 INSERT INTO attendance (employee_id, attendance_date, status, remarks)
                 VALUES (%s, %s, 'Leave', %s)
             """
-            return self.db.execute_insert(query, (employee_id, date, remarks))
+            attendance_id = self.db.execute_insert(query, (employee_id, date, remarks))
+        
+        self._invalidate_report_cache()
+        return attendance_id
     
     def get_attendance(self, employee_id, date):
         """
@@ -326,6 +386,29 @@ class AttendanceManager:
         """
         return self.db.execute_query(query, (employee_id, date), fetch_one=True)
     
+    def get_attendance_bulk(self, employee_ids, date):
+        """
+        Get attendance records for several employees on one date.
+        
+        Args:
+            employee_ids: IDs of employees
+            date: Date to check
+            
+        Returns:
+            Dictionary of employee_id -> attendance record (missing if none)
+        """
+        employee_ids = list(employee_ids)
+        if not employee_ids:
+            return {}
+        
+        placeholders = ', '.join(['%s'] * len(employee_ids))
+        query = f"""
+            SELECT * FROM attendance 
+            WHERE attendance_date = %s AND employee_id IN ({placeholders})
+        """
+        rows = self.db.execute_query(query, (date, *employee_ids)) or []
+        return {row['employee_id']: row for row in rows}
+    
     def get_attendance_by_date_range(self, employee_id, start_date, end_date):
         """
         Get attendance records for date range.
@@ -485,6 +568,9 @@ class AttendanceManager:
         
         result = self.db.execute_update(query, tuple(params))
         
+        if result > 0:
+            self._invalidate_report_cache()
+        
         # Log attendance update
         if result > 0 and user_id and old_attendance:
             from modules.employees import employee_manager
@@ -527,6 +613,9 @@ class AttendanceManager:
             (attendance_id,)
         )
         
+        if result > 0:
+            self._invalidate_report_cache()
+        
         # Log attendance deletion
         if result > 0 and user_id and attendance:
             from modules.employees import employee_manager
@@ -575,6 +664,11 @@ class AttendanceManager:
                 count += 1
         
         return count
+    
+    def _invalidate_report_cache(self):
+        """Drop cached dashboard statistics after an attendance change."""
+        from modules.reports import report_manager
+        report_manager.invalidate_cache()
 
 
 # Create a global attendance manager instance
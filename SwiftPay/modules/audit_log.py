@@ -3,15 +3,33 @@ SwiftPay Audit Log Module
 Handles logging of all system activities and user actions
 """
 
-import sys
-import os
 import json
+import time
+import queue
+import atexit
+import threading
+from collections import namedtuple
 from datetime import datetime
+from mysql.connector import Error
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
 
+# orjson encodes audit payloads several times faster than json; it is optional
+try:
+    import orjson
+    
+    def _dumps(values):
+        return orjson.dumps(values, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+except ImportError:
+    _dumps = json.dumps
+
+# One audit_log row, fields in INSERT_QUERY column order so executemany binds it
+# positionally; value dictionaries are JSON encoded once, when the record is built
+AuditRecord = namedtuple('AuditRecord', (
+    'user_id', 'action_type', 'entity_type', 'entity_id', 'description',
+    'old_values', 'new_values', 'ip_address', 'user_agent'
+))
+
 
 class AuditLogger:
     """
@@ -43,9 +61,43 @@ class AuditLogger:
     ENTITY_REPORT = 'REPORT'
     ENTITY_SYSTEM = 'SYSTEM'
     
+    # Background writer configuration
+    FLUSH_INTERVAL = 0.1
+    FLUSH_BATCH_SIZE = 100
+    # Longest flush() waits for the writer, so a stalled database cannot hang exit
+    FLUSH_TIMEOUT = 5.0
+    
+    INSERT_QUERY = """
+        INSERT INTO audit_log (
+            user_id, action_type, entity_type, entity_id,
+            action_description, old_values, new_values,
+            ip_address, user_agent
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    
     def __init__(self):
         """Initialize AuditLogger with database connection"""
         self.db = db
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._writer_connection = None
+    
+    def _build_params(self, user_id, action_type, entity_type, entity_id=None,
+                      description=None, old_values=None, new_values=None,
+                      ip_address=None, user_agent=None):
+        """Build the AuditRecord for an audit_log INSERT, JSON encoding value dictionaries"""
+        return AuditRecord(
+            user_id,
+            action_type,
+            entity_type,
+            entity_id,
+            description,
+            _dumps(old_values) if old_values else None,
+            _dumps(new_values) if new_values else None,
+            ip_address,
+            user_agent
+        )
     
     def log(self, user_id, action_type, entity_type, entity_id=None, 
             description=None, old_values=None, new_values=None, 
@@ -67,31 +119,12 @@ class AuditLogger:
         Returns:
             Log ID if successful, None otherwise
         """
-        # Convert dictionaries to JSON strings
-        old_json = json.dumps(old_values) if old_values else None
-        new_json = json.dumps(new_values) if new_values else None
-        
-        query = """
-            INSERT INTO audit_log (
-                user_id, action_type, entity_type, entity_id,
-                action_description, old_values, new_values,
-                ip_address, user_agent
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        params = (
-            user_id,
-            action_type,
-            entity_type,
-            entity_id,
-            description,
-            old_json,
-            new_json,
-            ip_address,
-            user_agent
+        params = self._build_params(
+            user_id, action_type, entity_type, entity_id,
+            description, old_values, new_values, ip_address, user_agent
         )
         
-        return self.db.execute_insert(query, params)
+        return self.db.execute_insert(self.INSERT_QUERY, params)
     
     def log_user_action(self, user_id, action_type, entity_type, entity_id=None,
                        description=None, old_values=None, new_values=None):
@@ -120,6 +153,100 @@ class AuditLogger:
             new_values=new_values
         )
     
+    def log_user_action_async(self, user_id, action_type, entity_type, entity_id=None,
+                              description=None, old_values=None, new_values=None):
+        """
+        Queue a user action for the background writer instead of inserting inline.
+        
+        Queued entries are written in batches every FLUSH_INTERVAL seconds on a
+        dedicated connection, and flushed at interpreter exit.
+        
+        Args:
+            user_id: ID of user performing the action
+            action_type: Type of action
+            entity_type: Type of entity
+            entity_id: ID of the affected entity
+            description: Description of the action
+            old_values: Old values dictionary
+            new_values: New values dictionary
+        """
+        self._ensure_writer()
+        self._queue.put(self._build_params(
+            user_id, action_type, entity_type, entity_id,
+            description, old_values, new_values
+        ))
+    
+    def flush(self, timeout=None):
+        """
+        Wait for queued audit entries to be written.
+        
+        Args:
+            timeout: Seconds to wait at most (defaults to FLUSH_TIMEOUT)
+            
+        Returns:
+            Boolean indicating if the queue was fully drained
+        """
+        if self._writer is None:
+            return True
+        deadline = time.monotonic() + (self.FLUSH_TIMEOUT if timeout is None else timeout)
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                print(f"Audit log flush timed out with {self._queue.unfinished_tasks} entries pending")
+                return False
+            time.sleep(self.FLUSH_INTERVAL / 2)
+        return True
+    
+    def _ensure_writer(self):
+        """Start the background writer thread on first use"""
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                writer = threading.Thread(target=self._run_writer, name='AuditLogWriter', daemon=True)
+                writer.start()
+                self._writer = writer
+                atexit.register(self.flush)
+    
+    def _run_writer(self):
+        """Drain the queue, grouping entries that arrive within FLUSH_INTERVAL"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            
+            while len(batch) < self.FLUSH_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                # Drop the batch but keep the thread alive for later entries
+                print(f"Audit log write error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _write_batch(self, batch):
+        """Insert a batch of audit rows on the writer's own connection"""
+        cursor = None
+        try:
+            conn = self._writer_connection
+            if conn is None or not conn.is_connected():
+                conn = self._writer_connection = self.db.create_connection()
+            cursor = conn.cursor()
+            cursor.executemany(self.INSERT_QUERY, batch)
+            conn.commit()
+        except Error as e:
+            print(f"Audit log write error: {e}")
+        finally:
+            if cursor:
+                cursor.close()
+    
     def get_logs(self, user_id=None, action_type=None, entity_type=None,
                  entity_id=None, start_date=None, end_date=None, limit=100):
         """
@@ -3,14 +3,11 @@ SwiftPay Employee Management Module
 Handles CRUD operations for employees
 """
 
-import sys
-import os
+import time
 from datetime import datetime
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
-from modules.audit_log import audit_logger, AuditLogger
+from .audit_log import audit_logger, AuditLogger
 
 
 class EmployeeManager:
@@ -18,9 +15,23 @@ class EmployeeManager:
     Manages employee records including CRUD operations.
     """
     
+    # Active employee list shared by dropdowns; writes here invalidate it
+    ACTIVE_CACHE_TTL = 60
+    
     def __init__(self):
         """Initialize EmployeeManager with database connection"""
         self.db = db
+        # (expires, rows, choices) for get_active_employees / get_active_employee_choices
+        self._active_cache = None
+    
+    def invalidate_cache(self):
+        """Drop the cached active employee list after employee changes"""
+        self._active_cache = None
+    
+    def _invalidate_report_cache(self):
+        """Drop cached dashboard statistics after an employee change."""
+        from modules.reports import report_manager
+        report_manager.invalidate_cache()
     
     def generate_employee_code(self):
         """
@@ -106,6 +117,9 @@ class EmployeeManager:
         )
         
         employee_id = self.db.execute_insert(query, params)
+        if employee_id:
+            self.invalidate_cache()
+            self._invalidate_report_cache()
         
         # Log employee creation
         if employee_id and user_id:
@@ -168,6 +182,9 @@ class EmployeeManager:
                     old_values[field] = old_employee[field]
         
         result = self.db.execute_update(query, tuple(params))
+        if result > 0:
+            self.invalidate_cache()
+            self._invalidate_report_cache()
         
         # Log employee update
         if result > 0 and user_id:
@@ -205,6 +222,9 @@ class EmployeeManager:
             query = "UPDATE employees SET status = 'Inactive' WHERE employee_id = %s"
         
         result = self.db.execute_update(query, (employee_id,))
+        if result > 0:
+            self.invalidate_cache()
+            self._invalidate_report_cache()
         
         # Log employee deletion
         if result > 0 and user_id and employee:
@@ -297,10 +317,44 @@ class EmployeeManager:
         """
         Get all active employees.
         
+        The list is cached for ACTIVE_CACHE_TTL seconds, so dialogs and
+        filters that open repeatedly do not re-query the database.
+        
         Returns:
             List of active employee dictionaries
         """
-        return self.get_all_employees(status_filter='Active')
+        entry = self._get_active_entry()
+        return list(entry[1]) if entry else None
+    
+    def get_active_employee_choices(self):
+        """
+        Get dropdown entries for all active employees.
+        
+        The labels are formatted once per cache load, so every dropdown
+        fill reuses them instead of rebuilding each name.
+        
+        Returns:
+            List of (employee_id, "CODE - First Last") tuples
+        """
+        entry = self._get_active_entry()
+        return list(entry[2]) if entry else None
+    
+    def _get_active_entry(self):
+        """Return the (expires, rows, choices) cache entry, reloading it when stale"""
+        now = time.monotonic()
+        entry = self._active_cache
+        if entry is not None and now < entry[0]:
+            return entry
+        
+        employees = self.get_all_employees(status_filter='Active')
+        if employees is None:
+            return None
+        choices = [
+            (emp['employee_id'], f"{emp['employee_code']} - {emp['first_name']} {emp['last_name']}")
+            for emp in employees
+        ]
+        entry = self._active_cache = (now + self.ACTIVE_CACHE_TTL, employees, choices)
+        return entry
     
     def get_employee_count(self, status_filter=None):
         """
@@ -3,15 +3,31 @@ SwiftPay Payroll Computation Module
 Handles payroll calculation, generation, and management
 """
 
-import sys
-import os
 from datetime import datetime, timedelta
+from itertools import chain
 from decimal import Decimal, ROUND_HALF_UP
+from mysql.connector import Error
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
-from modules.audit_log import audit_logger, AuditLogger
+from .audit_log import audit_logger, AuditLogger
+
+_ZERO = Decimal('0')
+
+
+def _to_decimal(value):
+    """
+    Convert a numeric value to Decimal without a string round-trip where possible.
+    
+    The MySQL driver already returns DECIMAL columns as Decimal and counts as
+    int; only genuine floats need the str() detour to stay exact.
+    """
+    if value is None:
+        return _ZERO
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return Decimal(value)
 
 
 class PayrollManager:
@@ -24,6 +40,11 @@ class PayrollManager:
     OVERTIME_MULTIPLIER = Decimal('1.25')
     STANDARD_HOURS_PER_DAY = 8
     WORKING_DAYS_PER_MONTH = 22
+    PAYROLL_BATCH_SIZE = 1000
+    
+    # Shared Decimal constants (avoid re-allocating on every calculation)
+    _Q2 = Decimal('0.01')
+    _Q60 = Decimal('60')
     
     def __init__(self):
         """Initialize PayrollManager with database connection"""
@@ -41,7 +62,7 @@ class PayrollManager:
         Returns:
             Basic pay amount
         """
-        return Decimal(str(hours_worked)) * Decimal(str(rate_per_hour))
+        return _to_decimal(hours_worked) * _to_decimal(rate_per_hour)
     
     def calculate_overtime_pay(self, overtime_hours, rate_per_hour):
         """
@@ -55,8 +76,8 @@ class PayrollManager:
         Returns:
             Overtime pay amount
         """
-        ot_rate = Decimal(str(rate_per_hour)) * self.OVERTIME_MULTIPLIER
-        return Decimal(str(overtime_hours)) * ot_rate
+        ot_rate = _to_decimal(rate_per_hour) * self.OVERTIME_MULTIPLIER
+        return _to_decimal(overtime_hours) * ot_rate
     
     def calculate_late_deduction(self, late_minutes, rate_per_hour):
         """
@@ -70,8 +91,8 @@ class PayrollManager:
         Returns:
             Late deduction amount
         """
-        minute_rate = Decimal(str(rate_per_hour)) / Decimal('60')
-        return Decimal(str(late_minutes)) * minute_rate
+        minute_rate = _to_decimal(rate_per_hour) / self._Q60
+        return _to_decimal(late_minutes) * minute_rate
     
     def calculate_absence_deduction(self, absences, daily_rate):
         """
@@ -85,7 +106,7 @@ class PayrollManager:
         Returns:
             Absence deduction amount
         """
-        return Decimal(str(absences)) * Decimal(str(daily_rate))
+        return _to_decimal(absences) * _to_decimal(daily_rate)
     
     def calculate_employee_payroll(self, employee_id, start_date, end_date):
         """
@@ -100,8 +121,15 @@ class PayrollManager:
             Dictionary with all payroll details
         """
         # Get employee information
-        emp_query = "SELECT * FROM employees WHERE employee_id = %s"
-        employee = self.db.execute_query(emp_query, (employee_id,), fetch_one=True)
+        emp_query = """
+            SELECT employee_id, employee_code,
+                   CONCAT(first_name, ' ', last_name) as employee_name,
+                   position, department, rate_per_hour, daily_rate, allowance,
+                   sss_deduction, philhealth_deduction, pagibig_deduction, tax_deduction
+            FROM employees
+            WHERE employee_id = %s
+        """
+        employee = self.db.execute_query(emp_query, (employee_id,), fetch_one=True, row_factory='ntuple')
         
         if not employee:
             return None
@@ -109,9 +137,9 @@ class PayrollManager:
         # Get attendance summary
         att_query = """
             SELECT 
-                COUNT(CASE WHEN status = 'Present' THEN 1 END) as days_present,
+                COUNT(CASE WHEN status = 'Present' THEN 1 END)
+                    + COUNT(CASE WHEN status = 'Half-Day' THEN 1 END) * 0.5 as days_worked,
                 COUNT(CASE WHEN status = 'Absent' THEN 1 END) as days_absent,
-                COUNT(CASE WHEN status = 'Half-Day' THEN 1 END) as days_halfday,
                 COALESCE(SUM(hours_worked), 0) as total_hours,
                 COALESCE(SUM(overtime_hours), 0) as overtime_hours,
                 COALESCE(SUM(late_minutes), 0) as total_late_minutes
@@ -120,33 +148,53 @@ class PayrollManager:
               AND attendance_date BETWEEN %s AND %s
               AND status IN ('Present', 'Half-Day', 'Absent')
         """
-        attendance = self.db.execute_query(att_query, (employee_id, start_date, end_date), fetch_one=True)
+        attendance = self.db.execute_query(
+            att_query, (employee_id, start_date, end_date), fetch_one=True, row_factory='ntuple'
+        )
         
+        return self._compute_payroll(employee, attendance)
+    
+    def _compute_payroll(self, employee, attendance):
+        """
+        Apply the payroll formulas to one employee's rates and attendance totals.
+        
+        Shared by the single-employee and batch calculation paths so both
+        produce identical figures.
+        
+        Args:
+            employee: Namedtuple row with the employee's rate and deduction columns
+            attendance: Namedtuple row with the attendance aggregate columns
+            
+        Returns:
+            Dictionary with all payroll details
+        """
         # Extract values
-        rate_per_hour = Decimal(str(employee.get('rate_per_hour', 0)))
-        daily_rate = Decimal(str(employee.get('daily_rate', 0)))
-        allowance = Decimal(str(employee.get('allowance', 0)))
+        rate_per_hour = _to_decimal(employee.rate_per_hour)
+        daily_rate = _to_decimal(employee.daily_rate)
+        allowance = _to_decimal(employee.allowance)
         
-        days_worked = (attendance.get('days_present', 0) or 0) + (attendance.get('days_halfday', 0) or 0) * Decimal('0.5')
-        hours_worked = Decimal(str(attendance.get('total_hours', 0) or 0))
-        overtime_hours = Decimal(str(attendance.get('overtime_hours', 0) or 0))
-        late_minutes = attendance.get('total_late_minutes', 0) or 0
-        absences = attendance.get('days_absent', 0) or 0
+        days_worked = _to_decimal(attendance.days_worked)
+        hours_worked = _to_decimal(attendance.total_hours)
+        overtime_hours = _to_decimal(attendance.overtime_hours)
+        late_minutes = attendance.total_late_minutes or 0
+        absences = attendance.days_absent or 0
         
-        # Calculate pays
-        basic_pay = self.calculate_basic_pay(hours_worked, rate_per_hour)
-        overtime_pay = self.calculate_overtime_pay(overtime_hours, rate_per_hour)
+        # Calculate pays (formulas inlined from calculate_basic_pay and
+        # calculate_overtime_pay; inputs are already Decimal here)
+        basic_pay = hours_worked * rate_per_hour
+        overtime_pay = overtime_hours * (rate_per_hour * self.OVERTIME_MULTIPLIER)
         
         # Calculate gross pay
         gross_pay = basic_pay + overtime_pay + allowance
         
         # Calculate deductions
-        sss = Decimal(str(employee.get('sss_deduction', 0)))
-        philhealth = Decimal(str(employee.get('philhealth_deduction', 0)))
-        pagibig = Decimal(str(employee.get('pagibig_deduction', 0)))
-        tax = Decimal(str(employee.get('tax_deduction', 0)))
-        late_deduction = self.calculate_late_deduction(late_minutes, rate_per_hour)
-        absence_deduction = self.calculate_absence_deduction(absences, daily_rate)
+        sss = _to_decimal(employee.sss_deduction)
+        philhealth = _to_decimal(employee.philhealth_deduction)
+        pagibig = _to_decimal(employee.pagibig_deduction)
+        tax = _to_decimal(employee.tax_deduction)
+        # Formulas inlined from calculate_late_deduction and calculate_absence_deduction
+        late_deduction = _to_decimal(late_minutes) * (rate_per_hour / self._Q60)
+        absence_deduction = _to_decimal(absences) * daily_rate
         
         total_deductions = sss + philhealth + pagibig + tax + late_deduction + absence_deduction
         
@@ -154,32 +202,123 @@ class PayrollManager:
         net_pay = gross_pay - total_deductions
         
         return {
-            'employee_id': employee_id,
-            'employee_code': employee.get('employee_code'),
-            'employee_name': f"{employee.get('first_name')} {employee.get('last_name')}",
-            'position': employee.get('position'),
-            'department': employee.get('department'),
-            'days_worked': float(days_worked),
-            'hours_worked': float(hours_worked),
-            'overtime_hours': float(overtime_hours),
+            'employee_id': employee.employee_id,
+            'employee_code': employee.employee_code,
+            'employee_name': employee.employee_name,
+            'position': employee.position,
+            'department': employee.department,
+            'days_worked': days_worked,
+            'hours_worked': hours_worked,
+            'overtime_hours': overtime_hours,
             'late_minutes': late_minutes,
             'absences': absences,
-            'rate_per_hour': float(rate_per_hour),
-            'daily_rate': float(daily_rate),
-            'basic_pay': float(basic_pay.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'overtime_pay': float(overtime_pay.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'allowance': float(allowance),
-            'gross_pay': float(gross_pay.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'sss_deduction': float(sss),
-            'philhealth_deduction': float(philhealth),
-            'pagibig_deduction': float(pagibig),
-            'tax_deduction': float(tax),
-            'late_deduction': float(late_deduction.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'absence_deduction': float(absence_deduction.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'total_deductions': float(total_deductions.quantize(Decimal('0.01'), ROUND_HALF_UP)),
-            'net_pay': float(net_pay.quantize(Decimal('0.01'), ROUND_HALF_UP))
+            'rate_per_hour': rate_per_hour,
+            'daily_rate': daily_rate,
+            'basic_pay': basic_pay.quantize(self._Q2, ROUND_HALF_UP),
+            'overtime_pay': overtime_pay.quantize(self._Q2, ROUND_HALF_UP),
+            'allowance': allowance,
+            'gross_pay': gross_pay.quantize(self._Q2, ROUND_HALF_UP),
+            'sss_deduction': sss,
+            'philhealth_deduction': philhealth,
+            'pagibig_deduction': pagibig,
+            'tax_deduction': tax,
+            'late_deduction': late_deduction.quantize(self._Q2, ROUND_HALF_UP),
+            'absence_deduction': absence_deduction.quantize(self._Q2, ROUND_HALF_UP),
+            'total_deductions': total_deductions.quantize(self._Q2, ROUND_HALF_UP),
+            'net_pay': net_pay.quantize(self._Q2, ROUND_HALF_UP)
         }
     
+    def get_payroll_inputs(self, start_date, end_date, after_id=0, limit=None):
+        """
+        Fetch rates and attendance totals for active employees in one query.
+        
+        Args:
+            start_date: Payroll period start
+            end_date: Payroll period end
+            after_id: Only include employees with a greater employee_id (keyset paging)
+            limit: Maximum rows to return (None for all)
+            
+        Returns:
+            List of namedtuple rows combining employee and attendance aggregate
+            columns, ordered by employee_id
+        """
+        query = """
+            SELECT 
+                e.employee_id, e.employee_code,
+                CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+                e.position, e.department, e.rate_per_hour, e.daily_rate, e.allowance,
+                e.sss_deduction, e.philhealth_deduction, e.pagibig_deduction, e.tax_deduction,
+                COUNT(CASE WHEN a.status = 'Present' THEN 1 END)
+                    + COUNT(CASE WHEN a.status = 'Half-Day' THEN 1 END) * 0.5 as days_worked,
+                COUNT(CASE WHEN a.status = 'Absent' THEN 1 END) as days_absent,
+                COALESCE(SUM(a.hours_worked), 0) as total_hours,
+                COALESCE(SUM(a.overtime_hours), 0) as overtime_hours,
+                COALESCE(SUM(a.late_minutes), 0) as total_late_minutes
+            FROM employees e
+            LEFT JOIN attendance a ON a.employee_id = e.employee_id
+                AND a.attendance_date BETWEEN %s AND %s
+                AND a.status IN ('Present', 'Half-Day', 'Absent')
+            WHERE e.status = 'Active' AND e.employee_id > %s
+            GROUP BY e.employee_id
+            ORDER BY e.employee_id
+        """
+        params = [start_date, end_date, after_id]
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        
+        return self.db.execute_query(query, tuple(params), row_factory='ntuple') or []
+    
+    def iter_payroll_batches(self, start_date, end_date, batch_size=None):
+        """
+        Calculate payroll for active employees one chunk at a time.
+        
+        Each chunk is a separate keyset-paged query, so memory stays bounded by
+        the batch size and the shared connection is free between chunks.
+        
+        Args:
+            start_date: Payroll period start
+            end_date: Payroll period end
+            batch_size: Employees per chunk (defaults to PAYROLL_BATCH_SIZE)
+            
+        Yields:
+            Lists of payroll detail dictionaries
+        """
+        batch_size = batch_size or self.PAYROLL_BATCH_SIZE
+        compute = self._compute_payroll
+        after_id = 0
+        
+        while True:
+            rows = self.get_payroll_inputs(start_date, end_date, after_id, batch_size)
+            if not rows:
+                break
+            
+            yield [compute(row, row) for row in rows]
+            
+            if len(rows) < batch_size:
+                break
+            after_id = rows[-1].employee_id
+    
+    def calculate_payroll_batch(self, start_date, end_date):
+        """
+        Calculate payroll for all active employees.
+        
+        Employee and attendance data are read in bulk and each row is run
+        through the same computation as calculate_employee_payroll.
+        
+        Args:
+            start_date: Payroll period start
+            end_date: Payroll period end
+            
+        Returns:
+            List of payroll detail dictionaries
+        """
+        records = []
+        for batch in self.iter_payroll_batches(start_date, end_date):
+            records.extend(batch)
+        return records
+    
     def generate_payroll(self, start_date, end_date, payroll_period=None, processed_by=None):
         """
         Generate payroll for all active employees.
@@ -196,11 +335,11 @@ class PayrollManager:
         if not payroll_period:
             payroll_period = f"{start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}"
         
-        # Get all active employees
-        emp_query = "SELECT employee_id FROM employees WHERE status = 'Active'"
-        employees = self.db.execute_query(emp_query)
+        # Calculate payroll for active employees in bounded chunks
+        batches = self.iter_payroll_batches(start_date, end_date)
+        first_batch = next(batches, None)
         
-        if not employees:
+        if not first_batch:
             return None
         
         # Create payroll header
@@ -213,26 +352,26 @@ class PayrollManager:
         if not payroll_id:
             return None
         
-        # Calculate and insert payroll details for each employee
+        # Insert payroll details one chunk at a time
+        detail_query = """
+            INSERT INTO payroll_details (
+                payroll_id, employee_id, days_worked, hours_worked, overtime_hours,
+                late_minutes, absences, basic_pay, overtime_pay, allowance, gross_pay,
+                sss_deduction, philhealth_deduction, pagibig_deduction, tax_deduction,
+                late_deduction, absence_deduction, total_deductions, net_pay
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        
         total_employees = 0
         total_gross = Decimal('0')
         total_deductions = Decimal('0')
         total_net = Decimal('0')
         
-        for emp in employees:
-            payroll_data = self.calculate_employee_payroll(emp['employee_id'], start_date, end_date)
+        for batch in chain((first_batch,), batches):
+            detail_rows = []
             
-            if payroll_data:
-                detail_query = """
-                    INSERT INTO payroll_details (
-                        payroll_id, employee_id, days_worked, hours_worked, overtime_hours,
-                        late_minutes, absences, basic_pay, overtime_pay, allowance, gross_pay,
-                        sss_deduction, philhealth_deduction, pagibig_deduction, tax_deduction,
-                        late_deduction, absence_deduction, total_deductions, net_pay
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                
-                params = (
+            for payroll_data in batch:
+                detail_rows.append((
                     payroll_id,
                     payroll_data['employee_id'],
                     payroll_data['days_worked'],
@@ -252,14 +391,15 @@ class PayrollManager:
                     payroll_data['absence_deduction'],
                     payroll_data['total_deductions'],
                     payroll_data['net_pay']
-                )
-                
-                self.db.execute_insert(detail_query, params)
+                ))
                 
                 total_employees += 1
-                total_gross += Decimal(str(payroll_data['gross_pay']))
-                total_deductions += Decimal(str(payroll_data['total_deductions']))
-                total_net += Decimal(str(payroll_data['net_pay']))
+                total_gross += payroll_data['gross_pay']
+                total_deductions += payroll_data['total_deductions']
+                total_net += payroll_data['net_pay']
+            
+            # The driver rewrites a batched INSERT into a single multi-row statement
+            self.db.execute_many(detail_query, detail_rows)
         
         # Update payroll header with totals
         update_query = """
@@ -270,15 +410,17 @@ class PayrollManager:
         """
         self.db.execute_update(update_query, (
             total_employees, 
-            float(total_gross), 
-            float(total_deductions), 
-            float(total_net),
+            total_gross, 
+            total_deductions, 
+            total_net,
             payroll_id
         ))
         
-        # Log payroll generation
+        self._invalidate_report_cache(payroll_id)
+        
+        # Log payroll generation (written in the background)
         if payroll_id and processed_by:
-            audit_logger.log_user_action(
+            audit_logger.log_user_action_async(
                 user_id=processed_by,
                 action_type=AuditLogger.ACTION_GENERATE,
                 entity_type=AuditLogger.ENTITY_PAYROLL,
@@ -368,44 +510,24 @@ class PayrollManager:
         Returns:
             List of payroll records
         """
+        query = """
+            SELECT p.*, u.full_name as processed_by_name
+            FROM payroll p
+            LEFT JOIN users u ON p.processed_by = u.user_id
+        """
+        params = []
+        
         if status_filter:
-            if limit:
-                query = """
-                    SELECT p.*, u.full_name as processed_by_name
-                    FROM payroll p
-                    LEFT JOIN users u ON p.processed_by = u.user_id
-                    WHERE p.status = %s
-                    ORDER BY p.created_at DESC
-                    LIMIT %s
-                """
-                return self.db.execute_query(query, (status_filter, limit))
-            else:
-                query = """
-                    SELECT p.*, u.full_name as processed_by_name
-                    FROM payroll p
-                    LEFT JOIN users u ON p.processed_by = u.user_id
-                    WHERE p.status = %s
-                    ORDER BY p.created_at DESC
-                """
-                return self.db.execute_query(query, (status_filter,))
-        else:
-            if limit:
-                query = """
-                    SELECT p.*, u.full_name as processed_by_name
-                    FROM payroll p
-                    LEFT JOIN users u ON p.processed_by = u.user_id
-                    ORDER BY p.created_at DESC
-                    LIMIT %s
-                """
-                return self.db.execute_query(query, (limit,))
-            else:
-                query = """
-                    SELECT p.*, u.full_name as processed_by_name
-                    FROM payroll p
-                    LEFT JOIN users u ON p.processed_by = u.user_id
-                    ORDER BY p.created_at DESC
-                """
-                return self.db.execute_query(query)
+            query += " WHERE p.status = %s"
+            params.append(status_filter)
+        
+        query += " ORDER BY p.created_at DESC"
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        
+        return self.db.execute_query(query, tuple(params) if params else None)
     
     def update_payroll_status(self, payroll_id, status, user_id=None):
         """
@@ -423,14 +545,30 @@ class PayrollManager:
         if status not in valid_statuses:
             return 0
         
-        # Get old status
-        payroll = self.get_payroll_by_id(payroll_id)
-        old_status = payroll.get('status') if payroll else None
+        # Read the old status and update in one transaction, locking the row once
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    "SELECT status, payroll_period FROM payroll WHERE payroll_id = %s FOR UPDATE",
+                    (payroll_id,)
+                )
+                payroll = cursor.fetchone()
+                if not payroll:
+                    return 0
+                
+                cursor.execute(
+                    "UPDATE payroll SET status = %s WHERE payroll_id = %s AND status != %s",
+                    (status, payroll_id, status)
+                )
+                result = cursor.rowcount
+        except Error as e:
+            print(f"Update error: {e}")
+            return -1
+        
+        old_status = payroll.get('status')
         
-        result = self.db.execute_update(
-            "UPDATE payroll SET status = %s WHERE payroll_id = %s",
-            (status, payroll_id)
-        )
+        if result > 0:
+            self._invalidate_report_cache(payroll_id)
         
         # Log status change
         if result > 0 and user_id and payroll:
@@ -458,14 +596,26 @@ class PayrollManager:
         Returns:
             Number of rows affected
         """
-        # Get payroll info before deletion
-        payroll = self.get_payroll_by_id(payroll_id)
+        # Read the audit fields and delete in one transaction, locking the row once
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    "SELECT payroll_period, status, total_net_pay FROM payroll WHERE payroll_id = %s FOR UPDATE",
+                    (payroll_id,)
+                )
+                payroll = cursor.fetchone()
+                if not payroll:
+                    return 0
+                
+                # Details will be cascade deleted
+                cursor.execute("DELETE FROM payroll WHERE payroll_id = %s", (payroll_id,))
+                result = cursor.rowcount
+        except Error as e:
+            print(f"Update error: {e}")
+            return -1
         
-        # Details will be cascade deleted
-        result = self.db.execute_update(
-            "DELETE FROM payroll WHERE payroll_id = %s",
-            (payroll_id,)
-        )
+        if result > 0:
+            self._invalidate_report_cache(payroll_id)
         
         # Log payroll deletion
         if result > 0 and user_id and payroll:
@@ -484,6 +634,17 @@ class PayrollManager:
         
         return result
     
+    def _invalidate_report_cache(self, payroll_id):
+        """
+        Drop cached payroll reports and dashboard statistics for a changed payroll.
+        
+        Args:
+            payroll_id: ID of the changed payroll
+        """
+        from .reports import report_manager
+        report_manager.invalidate_payroll_cache(payroll_id)
+        report_manager.invalidate_cache()
+    
     def get_employee_payroll_history(self, employee_id, limit=12):
         """
         Get payroll history for an employee.
@@ -3,96 +3,379 @@ SwiftPay Reports Module
 Handles report generation, CSV/PDF export
 """
 
-import sys
 import os
+import copy
 import csv
-from datetime import datetime
+import gzip
+import functools
+import time
+from datetime import date, datetime
+from decimal import Decimal
 from io import BytesIO
+from itertools import chain, groupby, product
+from types import MappingProxyType
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
+from workers import pdf
+from workers.pdf import (
+    write_pdf as _write_pdf,
+    format_amount as _fmt,
+    draw_payslip as _draw_payslip,
+    render_payslip as _render_one,
+)
 
-# Try to import reportlab for PDF generation
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    import os
-    HAS_REPORTLAB = True
+# ReportLab is imported, and fonts registered, on the first PDF export (see _ensure_pdf_ready)
+HAS_REPORTLAB = False
+UNICODE_FONT = None
+UNICODE_FONT_BOLD = None
+
+# PDF cell formatters keyed on exact value type; anything else falls back to str()
+_PDF_CELL_FORMATTERS = {
+    type(None): lambda value: '',
+    datetime: lambda value: value.strftime('%Y-%m-%d'),
+    float: lambda value: f"{value:,.2f}",
+    Decimal: lambda value: f"{value:,.2f}",
+}
+
+# Payroll summary PDF constants (built once, never change at runtime)
+_MONTHS = ("", "January", "February", "March", "April", "May", "June",
+           "July", "August", "September", "October", "November", "December")
+
+# Day labels for the weekly attendance chart, Monday first
+_WEEK_DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# Use PHP symbol until a font with the peso sign is registered
+_PESO = "PHP "
+
+# Short-lived dashboard results keyed on (method name, args, date)
+_RESULT_CACHE = {}
+
+# Background threads for PDF rendering requested from the UI
+_PDF_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Upper bound on payslip worker processes; each one loads ReportLab and fonts
+PAYSLIP_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_pdf_ready():
+    """
+    Import ReportLab, register fonts and build the shared PDF styles on first use.
+    
+    CSV-only workflows never call this, so they never load ReportLab.
     
-    # Try to register DejaVu Sans for Unicode support (peso sign)
+    Returns:
+        True if ReportLab is available
+    """
+    global HAS_REPORTLAB, UNICODE_FONT, UNICODE_FONT_BOLD, _PESO
+    global colors, letter, A4, getSampleStyleSheet, ParagraphStyle, inch
+    global SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
+    global TA_CENTER, TA_RIGHT, TA_LEFT, canvas
+    
+    # Try to import reportlab for PDF generation
     try:
-        # Try common system font paths
-        font_paths = [
-            ('C:/Windows/Fonts/DejaVuSans.ttf', 'C:/Windows/Fonts/DejaVuSans-Bold.ttf'),
-            ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
-            ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
-        ]
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, PageBreak
+        from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        return False
+    
+    # Fonts, the peso sign and the payslip colors live with the payslip workers
+    if not pdf.ensure_ready():
+        return False
+    
+    HAS_REPORTLAB = True
+    UNICODE_FONT, UNICODE_FONT_BOLD = pdf.UNICODE_FONT, pdf.UNICODE_FONT_BOLD
+    _PESO = pdf.PESO
+    
+    _build_pdf_styles()
+    _build_dashboard_styles()
+    return True
+
+
+def _build_pdf_styles():
+    """Build the paragraph and table styles shared by the report PDFs"""
+    global _TITLE_STYLE, _DATE_STYLE, _SUMMARY_TABLE_STYLE, _DETAILS_TABLE_STYLE_BASE
+    global _NEGATIVE_COLOR, _PAID_COLOR, _MUTED_COLOR
+    global _REPORT_TITLE_STYLE, _REPORT_SUBTITLE_STYLE, _REPORT_TABLE_STYLE
+    
+    sample_styles = getSampleStyleSheet()
+    
+    # Generic tabular reports (export_to_pdf and the bulk payroll export)
+    _REPORT_TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=sample_styles['Heading1'],
+        fontSize=18,
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+    
+    _REPORT_SUBTITLE_STYLE = ParagraphStyle(
+        'Subtitle',
+        parent=sample_styles['Normal'],
+        fontSize=10,
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+    
+    _REPORT_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')]),
+    ])
+    
+    # Use Helvetica-Bold for titles (always available, reliable)
+    _TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=sample_styles['Heading1'],
+        fontSize=22,
+        textColor=colors.HexColor('#0055FF'),
+        spaceAfter=15,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'  # Use built-in bold font for reliability
+    )
+    
+    _DATE_STYLE = ParagraphStyle(
+        'DateStyle',
+        parent=sample_styles['Normal'],
+        fontSize=11,
+        textColor=colors.HexColor('#6B7280'),
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+    
+    _SUMMARY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Use built-in bold font
+        ('FONTSIZE', (0, 0), (-1, 0), 13),
+        ('FONTSIZE', (0, 1), (0, 2), 11),
+        ('FONTSIZE', (1, 1), (1, 2), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
+        ('TOPPADDING', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 10),
+        ('BACKGROUND', (0, 1), (-1, 2), colors.HexColor('#F9FAFB')),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#E8F5E9')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, -1), (-1, -1), 12),
+        ('TEXTCOLOR', (1, -1), (1, -1), colors.HexColor('#1B5E20')),
+    ])
+    
+    # Base style for the payroll details table; per-row colors are appended per export
+    _DETAILS_TABLE_STYLE_BASE = (
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),  # Employees column
+        ('ALIGN', (4, 1), (6, -1), 'RIGHT'),  # Money columns
+        ('ALIGN', (7, 1), (7, -1), 'CENTER'),  # Status column
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Use built-in bold font
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
+        ('TOPPADDING', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 10),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')]),
+    )
+    
+    _NEGATIVE_COLOR = colors.HexColor('#DC2626')
+    _PAID_COLOR = colors.HexColor('#10B981')
+    _MUTED_COLOR = colors.HexColor('#6B7280')
+
+
+def _build_dashboard_styles():
+    """Build the paragraph and table styles used by the dashboard PDF"""
+    global _DASHBOARD_TITLE_STYLE, _DASHBOARD_DATE_STYLE, _HEADING_STYLE
+    global _STATS_TABLE_STYLE, _WEEKLY_TABLE_STYLE, _BREAKDOWN_TABLE_STYLE
+    
+    sample_styles = getSampleStyleSheet()
+    
+    _DASHBOARD_TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=sample_styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#0055FF'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    _DASHBOARD_DATE_STYLE = ParagraphStyle(
+        'DateStyle',
+        parent=sample_styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#6B7280'),
+        alignment=TA_CENTER
+    )
+    
+    _HEADING_STYLE = ParagraphStyle(
+        'SectionHeading',
+        parent=sample_styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#111827'),
+        spaceAfter=12,
+        spaceBefore=20
+    )
+    
+    _STATS_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')]),
+    ])
+    
+    _WEEKLY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ])
+    
+    _BREAKDOWN_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
+    ])
+
+
+def _text_color_runs(column, row_colors, first_row=1):
+    """
+    Build one TEXTCOLOR command per run of consecutive rows sharing a color.
+    
+    Args:
+        column: Table column index
+        row_colors: Color of each data row, in order
+        first_row: Table row index of the first data row
         
-        unicode_font_registered = False
-        font_name = 'Helvetica'
-        
-        for regular_path, bold_path in font_paths:
-            if os.path.exists(regular_path):
-                try:
-                    # Register regular font
-                    if 'DejaVu' in regular_path or 'dejavu' in regular_path.lower():
-                        font_name = 'DejaVuSans'
-                        pdfmetrics.registerFont(TTFont('DejaVuSans', regular_path))
-                        # Try to register bold if available
-                        if os.path.exists(bold_path):
-                            try:
-                                pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', bold_path))
-                            except:
-                                pass  # Bold not available, will use regular
-                        unicode_font_registered = True
-                        break
-                    elif 'arial' in regular_path.lower():
-                        font_name = 'Arial'
-                        pdfmetrics.registerFont(TTFont('Arial', regular_path))
-                        if os.path.exists(bold_path):
-                            try:
-                                pdfmetrics.registerFont(TTFont('Arial-Bold', bold_path))
-                            except:
-                                pass
-                        unicode_font_registered = True
-                        break
-                except Exception as e:
-                    print(f"Font registration error: {e}")
-                    continue
-        
-        # If no system font found, use built-in Helvetica
-        if not unicode_font_registered:
-            UNICODE_FONT = 'Helvetica'
-            UNICODE_FONT_BOLD = 'Helvetica-Bold'
-        else:
-            UNICODE_FONT = font_name
-            # For custom fonts, use regular font name and let ReportLab handle bold
-            # ReportLab can make fonts bold without needing a separate bold font file
-            # Only use -Bold suffix if it's actually registered
-            registered_fonts = pdfmetrics.getRegisteredFontNames()
-            bold_font_name = f'{font_name}-Bold'
-            if bold_font_name in registered_fonts:
-                UNICODE_FONT_BOLD = bold_font_name
-            else:
-                # Use regular font - ReportLab will handle bold rendering
-                UNICODE_FONT_BOLD = font_name
-    except Exception as e:
-        print(f"Font setup error: {e}")
-        UNICODE_FONT = 'Helvetica'
-        UNICODE_FONT_BOLD = 'Helvetica-Bold'
-        
-except ImportError:
-    HAS_REPORTLAB = False
-    UNICODE_FONT = None
-    UNICODE_FONT_BOLD = None
+    Returns:
+        List of TableStyle commands
+    """
+    commands = []
+    row = first_row
+    for color, run in groupby(row_colors):
+        length = sum(1 for _ in run)
+        commands.append(('TEXTCOLOR', (column, row), (column, row + length - 1), color))
+        row += length
+    return commands
+
+
+def _f(row, key):
+    """
+    Read a numeric column as a float, treating a missing or NULL value as zero.
+    
+    Args:
+        row: Result row dictionary
+        key: Column name
+        
+    Returns:
+        Float value
+    """
+    value = row.get(key)
+    return float(value) if value else 0.0
+
+
+def _month_bounds(year, month):
+    """
+    Get the half-open date range covering a calendar month.
+    
+    Comparing start_date against a range (instead of MONTH()/YEAR()) lets
+    MySQL use the index on start_date.
+    
+    Args:
+        year: Year
+        month: Month (1-12)
+        
+    Returns:
+        Tuple of (first day of the month, first day of the next month)
+    """
+    month_start = date(year, month, 1)
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return month_start, next_month
+
+
+def _query_variants(base, filters, suffix=''):
+    """
+    Pre-build every combination of optional filters for a query.
+    
+    Args:
+        base: Query text up to and including its WHERE clause
+        filters: Optional filter clauses, in parameter order
+        suffix: Trailing text (GROUP BY / ORDER BY)
+        
+    Returns:
+        Dictionary of query text keyed by a tuple of booleans, one per filter
+    """
+    return {
+        enabled: base + ''.join(clause for clause, on in zip(filters, enabled) if on) + suffix
+        for enabled in product((False, True), repeat=len(filters))
+    }
+
+
 
+def _ttl_cache(seconds=60):
+    """
+    Cache a ReportManager method's result for a few seconds.
+    
+    Results are keyed on the method name, its arguments and today's date,
+    so they also expire when the day rolls over. Failed lookups (None) are
+    not cached. Callers get a shallow copy, so cached results keep any
+    nested sequences as tuples.
+    
+    Args:
+        seconds: How long a cached result stays valid
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            today = datetime.now().date()
+            key = (func.__name__, args, today)
+            now = time.monotonic()
+            cached = _RESULT_CACHE.get(key)
+            if cached is not None and now - cached[0] < seconds:
+                return copy.copy(cached[1])
+            value = func(self, *args)
+            if value is None:
+                return None
+            # Entries from earlier days can never be hit again
+            for stale in [k for k in _RESULT_CACHE if k[2] != today]:
+                del _RESULT_CACHE[stale]
+            _RESULT_CACHE[key] = (now, value)
+            return copy.copy(value)
+        return wrapper
+    return decorator
 
 class ReportManager:
     """
@@ -100,30 +383,25 @@ class ReportManager:
     Supports CSV and PDF export formats.
     """
     
+    # Maximum number of payroll reports/summaries kept in memory
+    PAYROLL_CACHE_SIZE = 128
+    
     def __init__(self):
         """Initialize ReportManager with database connection"""
         self.db = db
+        self._payroll_report_cache = {}
+        self._payroll_summary_cache = {}
     
     # ==================== ATTENDANCE REPORTS ====================
     
-    def get_attendance_report(self, start_date, end_date, employee_id=None, department=None):
-        """
-        Generate attendance report data.
-        
-        Args:
-            start_date: Report start date
-            end_date: Report end date
-            employee_id: Filter by employee (optional)
-            department: Filter by department (optional)
-            
-        Returns:
-            List of attendance records
+    ATTENDANCE_REPORT_QUERIES = _query_variants(
         """
-        query = """
             SELECT 
                 a.attendance_date,
+                a.employee_id,
                 e.employee_code,
-                CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+                e.first_name,
+                e.last_name,
                 e.position,
                 e.department,
                 a.time_in,
@@ -136,20 +414,44 @@ class ReportManager:
             FROM attendance a
             JOIN employees e ON a.employee_id = e.employee_id
             WHERE a.attendance_date BETWEEN %s AND %s
+        """,
+        (" AND a.employee_id = %s", " AND e.department = %s"),
+        " ORDER BY a.attendance_date DESC, e.last_name, e.first_name"
+    )
+    
+    def get_attendance_report(self, start_date, end_date, employee_id=None, department=None):
         """
-        params = [start_date, end_date]
-        
-        if employee_id:
-            query += " AND a.employee_id = %s"
-            params.append(employee_id)
-        
-        if department:
-            query += " AND e.department = %s"
-            params.append(department)
+        Generate attendance report data.
         
-        query += " ORDER BY a.attendance_date DESC, e.last_name, e.first_name"
+        Args:
+            start_date: Report start date
+            end_date: Report end date
+            employee_id: Filter by employee (optional)
+            department: Filter by department (optional)
+            
+        Returns:
+            List of attendance records
+        """
+        query, params = self._attendance_report_query(start_date, end_date, employee_id, department)
+        return self._add_employee_names(self.db.execute_query(query, params))
+    
+    def _attendance_report_query(self, start_date, end_date, employee_id=None, department=None):
+        """
+        Select the attendance report query for the given filters.
         
-        return self.db.execute_query(query, tuple(params))
+        Args:
+            start_date: Report start date
+            end_date: Report end date
+            employee_id: Filter by employee (optional)
+            department: Filter by department (optional)
+            
+        Returns:
+            Tuple of (query, params)
+        """
+        filters = (employee_id, department)
+        key = tuple(bool(value) for value in filters)
+        params = (start_date, end_date) + tuple(value for value in filters if value)
+        return self.ATTENDANCE_REPORT_QUERIES[key], params
     
     def get_attendance_summary_report(self, start_date, end_date, department=None):
         """
@@ -166,13 +468,14 @@ class ReportManager:
         query = """
             SELECT 
                 e.employee_code,
-                CONCAT(e.first_name, ' ', e.last_name) as employee_name,
+                e.first_name,
+                e.last_name,
                 e.position,
                 e.department,
-                COUNT(CASE WHEN a.status = 'Present' THEN 1 END) as present_days,
-                COUNT(CASE WHEN a.status = 'Absent' THEN 1 END) as absent_days,
-                COUNT(CASE WHEN a.status = 'Leave' THEN 1 END) as leave_days,
-                COUNT(CASE WHEN a.status = 'Half-Day' THEN 1 END) as halfday_days,
+                COALESCE(SUM(a.status = 'Present'), 0) as present_days,
+                COALESCE(SUM(a.status = 'Absent'), 0) as absent_days,
+                COALESCE(SUM(a.status = 'Leave'), 0) as leave_days,
+                COALESCE(SUM(a.status = 'Half-Day'), 0) as halfday_days,
                 COALESCE(SUM(a.hours_worked), 0) as total_hours,
                 COALESCE(SUM(a.overtime_hours), 0) as total_overtime,
                 COALESCE(SUM(a.late_minutes), 0) as total_late_minutes
@@ -189,10 +492,125 @@ class ReportManager:
         
         query += " GROUP BY e.employee_id ORDER BY e.last_name, e.first_name"
         
-        return self.db.execute_query(query, tuple(params))
+        return self._add_employee_names(self.db.execute_query(query, tuple(params)))
+    
+    def get_attendance_combined(self, start_date, end_date, employee_id=None, department=None):
+        """
+        Generate attendance detail rows and per-employee summaries from one query.
+        
+        The summaries are accumulated from the detail rows in a single pass, so
+        only employees with attendance in the range are included. Use
+        get_attendance_summary_report when every active employee is needed.
+        
+        Args:
+            start_date: Report start date
+            end_date: Report end date
+            employee_id: Filter by employee (optional)
+            department: Filter by department (optional)
+            
+        Returns:
+            Dictionary with 'detail' and 'summary' lists
+        """
+        detail = self.get_attendance_report(start_date, end_date, employee_id, department) or []
+        status_keys = {
+            'Present': 'present_days',
+            'Absent': 'absent_days',
+            'Leave': 'leave_days',
+            'Half-Day': 'halfday_days'
+        }
+        summaries = {}
+        
+        for rec in detail:
+            summary = summaries.get(rec['employee_id'])
+            if summary is None:
+                summary = summaries[rec['employee_id']] = {
+                    'employee_code': rec['employee_code'],
+                    'employee_name': rec['employee_name'],
+                    'first_name': rec['first_name'],
+                    'last_name': rec['last_name'],
+                    'position': rec['position'],
+                    'department': rec['department'],
+                    'present_days': 0,
+                    'absent_days': 0,
+                    'leave_days': 0,
+                    'halfday_days': 0,
+                    'total_hours': 0,
+                    'total_overtime': 0,
+                    'total_late_minutes': 0
+                }
+            
+            status_key = status_keys.get(rec['status'])
+            if status_key:
+                summary[status_key] += 1
+            summary['total_hours'] += rec['hours_worked'] or 0
+            summary['total_overtime'] += rec['overtime_hours'] or 0
+            summary['total_late_minutes'] += rec['late_minutes'] or 0
+        
+        summary = sorted(summaries.values(), key=lambda row: (row['last_name'], row['first_name']))
+        
+        return {
+            'detail': detail,
+            'summary': summary
+        }
     
     # ==================== PAYROLL REPORTS ====================
     
+    PAYROLL_PERIOD_FILTERS = (" AND YEAR(p.start_date) = %s", " AND MONTH(p.start_date) = %s")
+    
+    PAYROLL_SUMMARY_QUERIES = _query_variants(
+        """
+            SELECT 
+                p.payroll_id,
+                p.payroll_period,
+                p.start_date,
+                p.end_date,
+                p.total_employees,
+                p.total_gross_pay,
+                p.total_deductions,
+                p.total_net_pay,
+                p.status,
+                p.processed_at,
+                u.full_name as processed_by_name
+            FROM payroll p
+            LEFT JOIN users u ON p.processed_by = u.user_id
+            WHERE 1=1
+        """,
+        PAYROLL_PERIOD_FILTERS,
+        " ORDER BY p.start_date DESC"
+    )
+    
+    PAYROLL_TOTALS_QUERIES = _query_variants(
+        """
+            SELECT 
+                COALESCE(SUM(p.total_gross_pay), 0) as total_gross,
+                COALESCE(SUM(p.total_deductions), 0) as total_deductions,
+                COALESCE(SUM(p.total_net_pay), 0) as total_net
+            FROM payroll p
+            WHERE 1=1
+        """,
+        PAYROLL_PERIOD_FILTERS
+    )
+    
+    PAYROLL_HEADER_QUERY = """
+        SELECT p.*, u.full_name as processed_by_name
+        FROM payroll p
+        LEFT JOIN users u ON p.processed_by = u.user_id
+    """
+    
+    PAYROLL_DETAILS_QUERY = """
+        SELECT 
+            pd.*,
+            e.employee_code,
+            e.first_name,
+            e.last_name,
+            e.position,
+            e.department
+        FROM payroll_details pd
+        JOIN employees e ON pd.employee_id = e.employee_id
+        WHERE pd.payroll_id = %s
+        ORDER BY e.last_name, e.first_name
+    """
+    
     def get_payroll_report(self, payroll_id):
         """
         Generate detailed payroll report.
@@ -201,39 +619,92 @@ class ReportManager:
             payroll_id: ID of payroll
             
         Returns:
-            Dictionary with payroll header and details
+            Read-only mapping with payroll header and details
         """
+        cached = self._get_cached(self._payroll_report_cache, payroll_id)
+        if cached is not None:
+            return cached
+        
         # Get payroll header
-        header_query = """
-            SELECT p.*, u.full_name as processed_by_name
-            FROM payroll p
-            LEFT JOIN users u ON p.processed_by = u.user_id
-            WHERE p.payroll_id = %s
-        """
+        header_query = self.PAYROLL_HEADER_QUERY + " WHERE p.payroll_id = %s"
         header = self.db.execute_query(header_query, (payroll_id,), fetch_one=True)
         
         if not header:
             return None
         
         # Get payroll details
-        details_query = """
-            SELECT 
-                pd.*,
-                e.employee_code,
-                CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                e.position,
-                e.department
-            FROM payroll_details pd
-            JOIN employees e ON pd.employee_id = e.employee_id
-            WHERE pd.payroll_id = %s
-            ORDER BY e.last_name, e.first_name
+        details = self._add_employee_names(self.db.execute_query(self.PAYROLL_DETAILS_QUERY, (payroll_id,)))
+        
+        report = MappingProxyType({
+            'header': MappingProxyType(header),
+            'details': tuple(MappingProxyType(row) for row in details or ())
+        })
+        
+        if details is not None:
+            self._set_cached(self._payroll_report_cache, payroll_id, report)
+        
+        return report
+    
+    def get_payroll_reports_bulk(self, payroll_ids):
         """
-        details = self.db.execute_query(details_query, (payroll_id,))
+        Generate detailed payroll reports for several payrolls at once.
         
-        return {
-            'header': header,
-            'details': details
-        }
+        Payrolls not already cached are fetched with one header query and one
+        details query in total, rather than two queries per payroll.
+        
+        Args:
+            payroll_ids: List of payroll IDs
+            
+        Returns:
+            Dictionary mapping payroll_id to its report, in the requested order
+            (payrolls that do not exist are omitted)
+        """
+        reports = {}
+        missing = []
+        
+        for payroll_id in payroll_ids:
+            cached = self._get_cached(self._payroll_report_cache, payroll_id)
+            if cached is not None:
+                reports[payroll_id] = cached
+            elif payroll_id not in missing:
+                missing.append(payroll_id)
+        
+        if missing:
+            placeholders = ', '.join(['%s'] * len(missing))
+            header_query = self.PAYROLL_HEADER_QUERY + f" WHERE p.payroll_id IN ({placeholders})"
+            details_query = f"""
+                SELECT 
+                    pd.*,
+                    e.employee_code,
+                    e.first_name,
+                    e.last_name,
+                    e.position,
+                    e.department
+                FROM payroll_details pd
+                JOIN employees e ON pd.employee_id = e.employee_id
+                WHERE pd.payroll_id IN ({placeholders})
+                ORDER BY pd.payroll_id, e.last_name, e.first_name
+            """
+            
+            headers = self.db.execute_query(header_query, tuple(missing)) or []
+            details = self._add_employee_names(self.db.execute_query(details_query, tuple(missing)))
+            
+            # Group details by payroll
+            details_by_payroll = {}
+            for row in details or ():
+                details_by_payroll.setdefault(row['payroll_id'], []).append(MappingProxyType(row))
+            
+            for header in headers:
+                payroll_id = header['payroll_id']
+                report = MappingProxyType({
+                    'header': MappingProxyType(header),
+                    'details': tuple(details_by_payroll.get(payroll_id, ()))
+                })
+                if details is not None:
+                    self._set_cached(self._payroll_report_cache, payroll_id, report)
+                reports[payroll_id] = report
+        
+        return {payroll_id: reports[payroll_id] for payroll_id in payroll_ids if payroll_id in reports}
     
     def get_payroll_summary_report(self, year=None, month=None):
         """
@@ -244,56 +715,117 @@ class ReportManager:
             month: Filter by month
             
         Returns:
-            List of payroll summaries
+            Tuple of read-only payroll summaries
         """
-        where_clause = "WHERE 1=1"
-        params = []
+        cache_key = (year, month)
+        cached = self._get_cached(self._payroll_summary_cache, cache_key)
+        if cached is not None:
+            return cached
         
-        if year:
-            where_clause += " AND YEAR(p.start_date) = %s"
-            params.append(year)
-        if month:
-            where_clause += " AND MONTH(p.start_date) = %s"
-            params.append(month)
+        key, params = self._payroll_summary_filter(year, month)
+        rows = self.db.execute_query(self.PAYROLL_SUMMARY_QUERIES[key], params)
         
-        query = f"""
-            SELECT 
-                p.payroll_id,
-                p.payroll_period,
-                p.start_date,
-                p.end_date,
-                p.total_employees,
-                p.total_gross_pay,
-                p.total_deductions,
-                p.total_net_pay,
-                p.status,
-                p.processed_at,
-                u.full_name as processed_by_name
-            FROM payroll p
-            LEFT JOIN users u ON p.processed_by = u.user_id
-            {where_clause}
-            ORDER BY p.start_date DESC
+        if rows is None:
+            return None
+        
+        summaries = tuple(MappingProxyType(row) for row in rows)
+        self._set_cached(self._payroll_summary_cache, cache_key, summaries)
+        return summaries
+    
+    def get_payroll_summary_totals(self, year=None, month=None):
+        """
+        Get pay totals across the payrolls of the summary report.
+        
+        Args:
+            year: Filter by year
+            month: Filter by month
+            
+        Returns:
+            Dictionary with total_gross, total_deductions and total_net
         """
+        key, params = self._payroll_summary_filter(year, month)
+        result = self.db.execute_query(self.PAYROLL_TOTALS_QUERIES[key], params, fetch_one=True) or {}
         
-        return self.db.execute_query(query, tuple(params) if params else None)
+        return {
+            'total_gross': _f(result, 'total_gross'),
+            'total_deductions': _f(result, 'total_deductions'),
+            'total_net': _f(result, 'total_net')
+        }
     
-    # ==================== EMPLOYEE REPORTS ====================
+    def _payroll_summary_filter(self, year=None, month=None):
+        """
+        Resolve the query variant key and params for the payroll summary filters.
+        
+        Args:
+            year: Filter by year
+            month: Filter by month
+            
+        Returns:
+            Tuple of (variant key, params)
+        """
+        filters = (year, month)
+        key = tuple(bool(value) for value in filters)
+        params = tuple(value for value in filters if value)
+        return key, params or None
     
-    def get_employee_list_report(self, status_filter=None, department=None):
+    def invalidate_payroll_cache(self, payroll_id=None):
         """
-        Generate employee list report.
+        Drop cached payroll reports after a payroll is created, changed or deleted.
         
         Args:
-            status_filter: Filter by status
-            department: Filter by department
+            payroll_id: ID of the changed payroll (None clears every cached report)
+        """
+        if payroll_id is None:
+            self._payroll_report_cache.clear()
+        else:
+            self._payroll_report_cache.pop(payroll_id, None)
+        
+        # Any payroll change can alter the period summaries
+        self._payroll_summary_cache.clear()
+    
+    def invalidate_cache(self):
+        """
+        Drop cached dashboard statistics after attendance, payroll or employee changes.
+        """
+        _RESULT_CACHE.clear()
+    
+    def _get_cached(self, cache, key):
+        """
+        Look up a cached value, marking it as most recently used.
+        
+        Args:
+            cache: Cache dictionary
+            key: Cache key
             
         Returns:
-            List of employees
+            Cached value or None
+        """
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+        return value
+    
+    def _set_cached(self, cache, key, value):
+        """
+        Store a value, evicting the least recently used entry when full.
+        
+        Args:
+            cache: Cache dictionary
+            key: Cache key
+            value: Value to store
+        """
+        if len(cache) >= self.PAYROLL_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+    
+    # ==================== EMPLOYEE REPORTS ====================
+    
+    EMPLOYEE_LIST_QUERIES = _query_variants(
         """
-        query = """
             SELECT 
                 employee_code,
-                CONCAT(first_name, ' ', last_name) as employee_name,
+                first_name,
+                last_name,
                 email,
                 phone,
                 position,
@@ -308,20 +840,77 @@ class ReportManager:
                 date_hired
             FROM employees
             WHERE 1=1
+        """,
+        (" AND status = %s", " AND department = %s"),
+        " ORDER BY last_name, first_name"
+    )
+    
+    def get_employee_list_report(self, status_filter=None, department=None):
         """
-        params = []
+        Generate employee list report.
         
-        if status_filter:
-            query += " AND status = %s"
-            params.append(status_filter)
+        Args:
+            status_filter: Filter by status
+            department: Filter by department
+            
+        Returns:
+            List of employees
+        """
+        query, params = self._employee_list_query(status_filter, department)
+        return self._add_employee_names(self.db.execute_query(query, params))
+    
+    def _employee_list_query(self, status_filter=None, department=None):
+        """
+        Select the employee list query for the given filters.
         
-        if department:
-            query += " AND department = %s"
-            params.append(department)
+        Args:
+            status_filter: Filter by status
+            department: Filter by department
+            
+        Returns:
+            Tuple of (query, params)
+        """
+        filters = (status_filter, department)
+        key = tuple(bool(value) for value in filters)
+        params = tuple(value for value in filters if value)
+        return self.EMPLOYEE_LIST_QUERIES[key], params or None
+    
+    # ==================== EMPLOYEE NAMES ====================
+    
+    def _add_employee_names(self, rows):
+        """
+        Fill in employee_name from first_name and last_name on report rows.
         
-        query += " ORDER BY last_name, first_name"
+        Names are joined here rather than with CONCAT so the report queries
+        can sort on the (last_name, first_name) index.
         
-        return self.db.execute_query(query, tuple(params) if params else None)
+        Args:
+            rows: List of report rows (or None)
+            
+        Returns:
+            The same list with employee_name set on every row
+        """
+        if rows:
+            for row in rows:
+                row['employee_name'] = f"{row['first_name']} {row['last_name']}"
+        return rows
+    
+    def _iter_employee_names(self, rows):
+        """
+        Stream report rows with employee_name filled in.
+        
+        Args:
+            rows: Iterator of report rows
+            
+        Yields:
+            Report rows with employee_name set
+        """
+        try:
+            for row in rows:
+                row['employee_name'] = f"{row['first_name']} {row['last_name']}"
+                yield row
+        finally:
+            rows.close()
     
     # ==================== CSV EXPORT ====================
     
@@ -330,44 +919,55 @@ class ReportManager:
         Export data to CSV file.
         
         Args:
-            data: List of dictionaries to export
-            filename: Output file path
+            data: List or iterator of dictionaries to export
+            filename: Output file path (gzip-compressed when it ends with .gz)
             headers: Column headers (optional, uses dict keys if not provided)
             
         Returns:
             Boolean indicating success
         """
-        if not data:
+        rows = iter(data or ())
+        first_row = next(rows, None)
+        
+        if first_row is None:
             return False
         
+        columns = tuple(headers) if headers else tuple(first_row.keys())
+        
+        def format_value(value):
+            # Convert any non-string values
+            if value is None:
+                return ''
+            if value.__class__ is datetime:
+                return value.strftime('%Y-%m-%d %H:%M:%S')
+            return str(value)
+        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                if headers:
-                    writer = csv.DictWriter(csvfile, fieldnames=headers)
-                else:
-                    writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-                
-                writer.writeheader()
+            if filename.endswith('.gz'):
+                # Fastest compression level; CSV still shrinks several times over
+                csvfile = gzip.open(filename, 'wt', newline='', encoding='utf-8', compresslevel=1)
+            else:
+                csvfile = open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20)
+            
+            with csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(columns)
                 
-                for row in data:
-                    # Convert any non-string values
-                    clean_row = {}
-                    for key, value in row.items():
-                        if headers and key not in headers:
-                            continue
-                        if value is None:
-                            clean_row[key] = ''
-                        elif isinstance(value, datetime):
-                            clean_row[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                        else:
-                            clean_row[key] = str(value)
-                    writer.writerow(clean_row)
+                # writerows drains the generator in a single C-level loop
+                writer.writerows(
+                    [format_value(row.get(column)) for column in columns]
+                    for row in chain((first_row,), rows)
+                )
             
             return True
             
         except Exception as e:
             print(f"CSV export error: {e}")
             return False
+        finally:
+            # Release a streamed cursor that was abandoned mid-export
+            if hasattr(rows, 'close'):
+                rows.close()
     
     def export_attendance_csv(self, start_date, end_date, filename, employee_id=None):
         """
@@ -382,7 +982,7 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        data = self.get_attendance_report(start_date, end_date, employee_id)
+        query, params = self._attendance_report_query(start_date, end_date, employee_id)
         
         headers = [
             'attendance_date', 'employee_code', 'employee_name', 'position',
@@ -390,7 +990,8 @@ class ReportManager:
             'late_minutes', 'status', 'remarks'
         ]
         
-        return self.export_to_csv(data, filename, headers)
+        rows = self._iter_employee_names(self.db.iter_query(query, params))
+        return self.export_to_csv(rows, filename, headers)
     
     def export_payroll_csv(self, payroll_id, filename):
         """
@@ -403,11 +1004,6 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        report = self.get_payroll_report(payroll_id)
-        
-        if not report or not report.get('details'):
-            return False
-        
         headers = [
             'employee_code', 'employee_name', 'position', 'department',
             'days_worked', 'hours_worked', 'overtime_hours', 'basic_pay',
@@ -416,7 +1012,8 @@ class ReportManager:
             'late_deduction', 'absence_deduction', 'total_deductions', 'net_pay'
         ]
         
-        return self.export_to_csv(report['details'], filename, headers)
+        rows = self._iter_employee_names(self.db.iter_query(self.PAYROLL_DETAILS_QUERY, (payroll_id,)))
+        return self.export_to_csv(rows, filename, headers)
     
     def export_employees_csv(self, filename, status_filter=None):
         """
@@ -429,8 +1026,17 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        data = self.get_employee_list_report(status_filter)
-        return self.export_to_csv(data, filename)
+        query, params = self._employee_list_query(status_filter)
+        
+        headers = [
+            'employee_code', 'employee_name', 'email', 'phone', 'position',
+            'department', 'rate_per_hour', 'daily_rate', 'allowance',
+            'sss_deduction', 'philhealth_deduction', 'pagibig_deduction',
+            'status', 'date_hired'
+        ]
+        
+        rows = self._iter_employee_names(self.db.iter_query(query, params))
+        return self.export_to_csv(rows, filename, headers)
     
     # ==================== PDF EXPORT ====================
     
@@ -448,7 +1054,7 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        if not HAS_REPORTLAB:
+        if not _ensure_pdf_ready():
             print("ReportLab library not installed. Install with: pip install reportlab")
             return False
         
@@ -457,71 +1063,56 @@ class ReportManager:
         
         try:
             pagesize = letter if orientation == 'portrait' else (letter[1], letter[0])
-            doc = SimpleDocTemplate(filename, pagesize=pagesize)
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=pagesize)
             
             elements = []
-            styles = getSampleStyleSheet()
             
             # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                alignment=TA_CENTER,
-                spaceAfter=20
-            )
-            elements.append(Paragraph(title, title_style))
+            elements.append(Paragraph(title, _REPORT_TITLE_STYLE))
             
             # Subtitle with date
-            subtitle_style = ParagraphStyle(
-                'Subtitle',
-                parent=styles['Normal'],
-                fontSize=10,
-                alignment=TA_CENTER,
-                spaceAfter=20
-            )
-            elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y %I:%M %p')}", subtitle_style))
-            
-            # Build table data
-            table_data = [headers]
-            for row in data:
-                row_data = []
-                for header in headers:
-                    value = row.get(header, '')
-                    if value is None:
-                        value = ''
-                    elif isinstance(value, datetime):
-                        value = value.strftime('%Y-%m-%d')
-                    elif isinstance(value, float):
-                        value = f"{value:,.2f}"
-                    row_data.append(str(value))
-                table_data.append(row_data)
-            
-            # Create table
-            table = Table(table_data, repeatRows=1)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')]),
-            ]))
+            elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y %I:%M %p')}", _REPORT_SUBTITLE_STYLE))
             
-            elements.append(table)
+            elements.append(self._build_pdf_table(data, headers))
             
             # Build PDF
             doc.build(elements)
+            _write_pdf(filename, buffer)
             return True
             
         except Exception as e:
             print(f"PDF export error: {e}")
             return False
     
+    def _build_pdf_table(self, data, headers):
+        """
+        Build a styled PDF table from report rows.
+        
+        Args:
+            data: List of dictionaries to export
+            headers: Column headers
+            
+        Returns:
+            ReportLab Table
+        """
+        # Build table data
+        formatters = _PDF_CELL_FORMATTERS
+        table_data = [headers]
+        for row in data:
+            row_data = []
+            for header in headers:
+                value = row.get(header, '')
+                fmt = formatters.get(type(value))
+                row_data.append(fmt(value) if fmt else str(value))
+            table_data.append(row_data)
+        
+        # Create table
+        table = Table(table_data, repeatRows=1)
+        table.setStyle(_REPORT_TABLE_STYLE)
+        
+        return table
+    
     def export_attendance_pdf(self, start_date, end_date, filename, employee_id=None):
         """
         Export attendance report to PDF.
@@ -567,6 +1158,53 @@ class ReportManager:
         
         return self.export_to_pdf(title, report['details'], headers, filename, 'landscape')
     
+    def export_payrolls_pdf_bulk(self, payroll_ids, filename):
+        """
+        Export several payroll reports to one PDF, one section per payroll.
+        
+        Args:
+            payroll_ids: List of payroll IDs
+            filename: Output file path
+            
+        Returns:
+            Boolean indicating success
+        """
+        if not _ensure_pdf_ready():
+            print("ReportLab library not installed. Install with: pip install reportlab")
+            return False
+        
+        reports = self.get_payroll_reports_bulk(payroll_ids)
+        
+        if not reports:
+            return False
+        
+        headers = ['employee_code', 'employee_name', 'basic_pay', 'overtime_pay',
+                   'gross_pay', 'total_deductions', 'net_pay']
+        
+        try:
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=(letter[1], letter[0]))
+            generated_on = f"Generated on: {datetime.now().strftime('%B %d, %Y %I:%M %p')}"
+            
+            elements = []
+            for report in reports.values():
+                if elements:
+                    elements.append(PageBreak())
+                
+                title = f"Payroll Report: {report['header'].get('payroll_period', 'N/A')}"
+                elements.append(Paragraph(title, _REPORT_TITLE_STYLE))
+                elements.append(Paragraph(generated_on, _REPORT_SUBTITLE_STYLE))
+                elements.append(self._build_pdf_table(report['details'], headers))
+            
+            # Build PDF
+            doc.build(elements)
+            _write_pdf(filename, buffer)
+            return True
+            
+        except Exception as e:
+            print(f"PDF export error: {e}")
+            return False
+    
     def export_payroll_summary_pdf(self, year=None, month=None, filename=None):
         """
         Export payroll summary report to PDF.
@@ -579,15 +1217,14 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        if not HAS_REPORTLAB:
+        if not _ensure_pdf_ready():
             print("ReportLab not available. Cannot generate PDF.")
             return False
         
         try:
-            import os
             # Create directory if it doesn't exist
             dir_path = os.path.dirname(filename) if filename else ''
-            if dir_path and not os.path.exists(dir_path):
+            if dir_path:
                 os.makedirs(dir_path, exist_ok=True)
             
             # Get payroll summary data
@@ -597,23 +1234,15 @@ class ReportManager:
                 print("No payroll data to export")
                 return False
             
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-            
-            doc = SimpleDocTemplate(filename, pagesize=letter)
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter)
+            doc.allowSplitting = 1
             elements = []
-            styles = getSampleStyleSheet()
             
             # Title
             month_name = ""
             if month:
-                months = ["", "January", "February", "March", "April", "May", "June",
-                         "July", "August", "September", "October", "November", "December"]
-                month_name = months[month] + " "
+                month_name = _MONTHS[month] + " "
             
             title_text = f"Payroll Summary Report"
             if year:
@@ -621,42 +1250,20 @@ class ReportManager:
             elif month:
                 title_text += f" - {month_name}"
             
-            # Use Helvetica-Bold for titles (always available, reliable)
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=22,
-                textColor=colors.HexColor('#0055FF'),
-                spaceAfter=15,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold'  # Use built-in bold font for reliability
-            )
-            elements.append(Paragraph(title_text, title_style))
+            elements.append(Paragraph(title_text, _TITLE_STYLE))
             elements.append(Spacer(1, 0.15*inch))
             
             # Date
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor=colors.HexColor('#6B7280'),
-                alignment=TA_CENTER,
-                spaceAfter=20
-            )
-            elements.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style))
+            elements.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", _DATE_STYLE))
             elements.append(Spacer(1, 0.35*inch))
             
             # Summary statistics
-            total_gross = sum(float(rec.get('total_gross_pay', 0) or 0) for rec in data)
-            total_deductions = sum(float(rec.get('total_deductions', 0) or 0) for rec in data)
-            total_net = sum(float(rec.get('total_net_pay', 0) or 0) for rec in data)
+            totals = self.get_payroll_summary_totals(year, month)
             
-            # Format amounts with peso sign - using Paragraph for better Unicode support
-            # Use PHP symbol if peso sign not supported
-            peso_symbol = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
-            total_gross_str = f"{peso_symbol}{total_gross:,.2f}"
-            total_deductions_str = f"{peso_symbol}{total_deductions:,.2f}"
-            total_net_str = f"{peso_symbol}{total_net:,.2f}"
+            # Format amounts with peso sign
+            total_gross_str = _fmt(totals['total_gross'])
+            total_deductions_str = _fmt(totals['total_deductions'])
+            total_net_str = _fmt(totals['total_net'])
             
             summary_data = [
                 ['Metric', 'Amount'],
@@ -666,27 +1273,7 @@ class ReportManager:
             ]
             
             summary_table = Table(summary_data, colWidths=[3.5*inch, 2.5*inch])
-            font_name = 'Helvetica-Bold'  # Use built-in bold font
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), font_name),
-                ('FONTSIZE', (0, 0), (-1, 0), 13),
-                ('FONTSIZE', (0, 1), (0, 2), 11),
-                ('FONTSIZE', (1, 1), (1, 2), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
-                ('TOPPADDING', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
-                ('TOPPADDING', (0, 1), (-1, -1), 10),
-                ('BACKGROUND', (0, 1), (-1, 2), colors.HexColor('#F9FAFB')),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#E8F5E9')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
-                ('FONTNAME', (0, -1), (-1, -1), font_name),
-                ('FONTSIZE', (0, -1), (-1, -1), 12),
-                ('TEXTCOLOR', (1, -1), (1, -1), colors.HexColor('#1B5E20')),
-            ]))
+            summary_table.setStyle(_SUMMARY_TABLE_STYLE)
             elements.append(summary_table)
             elements.append(Spacer(1, 0.4*inch))
             
@@ -698,6 +1285,7 @@ class ReportManager:
             # Track row colors for negative values and status
             net_pay_colors = []
             status_colors = []
+            add_row = table_data.append
             
             for rec in data:
                 period = rec.get('payroll_period', 'N/A')
@@ -710,65 +1298,33 @@ class ReportManager:
                 employees = str(rec.get('total_employees', 0))
                 
                 # Format amounts with peso sign
-                gross_val = float(rec.get('total_gross_pay', 0) or 0)
-                deductions_val = float(rec.get('total_deductions', 0) or 0)
-                net_val = float(rec.get('total_net_pay', 0) or 0)
-                
-                peso_symbol = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
-                gross = f"{peso_symbol}{gross_val:,.2f}"
-                deductions = f"{peso_symbol}{deductions_val:,.2f}"
-                net = f"{peso_symbol}{net_val:,.2f}"
+                gross = _fmt(rec.get('total_gross_pay'))
+                deductions = _fmt(rec.get('total_deductions'))
+                net_val = _f(rec, 'total_net_pay')
+                net = _fmt(net_val)
                 
                 status = rec.get('status', 'N/A')
                 
-                # Track colors for this row
-                net_pay_colors.append(colors.HexColor('#DC2626') if net_val < 0 else colors.black)
-                status_colors.append(colors.HexColor('#10B981') if status == 'Paid' else colors.HexColor('#6B7280'))
-                
-                table_data.append([period, str(start), str(end), employees, gross, deductions, net, status])
-            
-            # Create table with improved column widths
-            table = Table(table_data, colWidths=[1.5*inch, 1*inch, 1*inch, 0.8*inch, 1.1*inch, 1.1*inch, 1.1*inch, 0.9*inch])
-            
-            # Build table style with improved formatting
-            table_style = [
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (3, 1), (3, -1), 'CENTER'),  # Employees column
-                ('ALIGN', (4, 1), (6, -1), 'RIGHT'),  # Money columns
-                ('ALIGN', (7, 1), (7, -1), 'CENTER'),  # Status column
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),  # Use built-in bold font
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 14),
-                ('TOPPADDING', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
-                ('TOPPADDING', (0, 1), (-1, -1), 10),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')]),
-            ]
+                add_row([period, str(start), str(end), employees, gross, deductions, net, status])
+                net_pay_colors.append(_NEGATIVE_COLOR if net_val < 0 else colors.black)
+                status_colors.append(_PAID_COLOR if status == 'Paid' else _MUTED_COLOR)
             
-            # Add color coding for net pay and status columns
-            for i, (net_color, status_color) in enumerate(zip(net_pay_colors, status_colors)):
-                row = i + 1  # +1 because row 0 is header
-                table_style.append(('TEXTCOLOR', (6, row), (6, row), net_color))
-                table_style.append(('TEXTCOLOR', (7, row), (7, row), status_color))
+            # LongTable splits across pages without re-measuring the whole table each time
+            table = LongTable(table_data, colWidths=[1.5*inch, 1*inch, 1*inch, 0.8*inch, 1.1*inch, 1.1*inch, 1.1*inch, 0.9*inch], repeatRows=1)
             
+            # Color net pay and status columns with one command per run of equal colors
+            table_style = list(_DETAILS_TABLE_STYLE_BASE)
+            table_style.extend(_text_color_runs(6, net_pay_colors))
+            table_style.extend(_text_color_runs(7, status_colors))
             table.setStyle(TableStyle(table_style))
             elements.append(table)
             
-            # Build PDF
+            # Build PDF (raises if the file cannot be written)
             doc.build(elements)
+            _write_pdf(filename, buffer)
             
-            # Verify file was created
-            if os.path.exists(filename):
-                print(f"Payroll summary PDF created successfully: {filename}")
-                return True
-            else:
-                print(f"Error: PDF file was not created at {filename}")
-                return False
+            print(f"Payroll summary PDF created successfully: {filename}")
+            return True
                 
         except PermissionError as e:
             print(f"Permission error generating payroll summary PDF: {e}")
@@ -784,6 +1340,16 @@ class ReportManager:
             print(f"Traceback: {traceback.format_exc()}")
             raise  # Re-raise to be caught by UI layer with better error handling
     
+    PAYSLIP_QUERY = """
+        SELECT pd.*, p.payroll_period, p.start_date, p.end_date,
+               e.employee_code, e.first_name, e.last_name,
+               e.position, e.department
+        FROM payroll_details pd
+        JOIN payroll p ON pd.payroll_id = p.payroll_id
+        JOIN employees e ON pd.employee_id = e.employee_id
+        WHERE pd.payroll_id = %s
+    """
+    
     def generate_payslip_pdf(self, payroll_id, employee_id, filename):
         """
         Generate individual payslip PDF.
@@ -796,232 +1362,288 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        if not HAS_REPORTLAB:
+        if not _ensure_pdf_ready():
             print("ReportLab library not installed")
             return False
         
         # Get payslip data
-        query = """
-            SELECT pd.*, p.payroll_period, p.start_date, p.end_date,
-                   e.employee_code, e.first_name, e.last_name,
-                   CONCAT(e.first_name, ' ', e.last_name) as employee_name,
-                   e.position, e.department
-            FROM payroll_details pd
-            JOIN payroll p ON pd.payroll_id = p.payroll_id
-            JOIN employees e ON pd.employee_id = e.employee_id
-            WHERE pd.payroll_id = %s AND pd.employee_id = %s
-        """
-        payslip = self.db.execute_query(query, (payroll_id, employee_id), fetch_one=True)
+        payslip = self._get_payslip(payroll_id, employee_id)
         
         if not payslip:
             return False
         
-        try:
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Company header
-            title_style = ParagraphStyle(
-                'CompanyTitle',
-                parent=styles['Heading1'],
-                fontSize=20,
-                alignment=TA_CENTER,
-                textColor=colors.HexColor('#2c3e50'),
-                spaceAfter=5
-            )
-            elements.append(Paragraph("SwiftPay", title_style))
-            elements.append(Paragraph("PAYSLIP", ParagraphStyle('Subtitle', fontSize=14, alignment=TA_CENTER, spaceAfter=20)))
-            
-            # Employee info
-            info_data = [
-                ['Employee Code:', payslip.get('employee_code', ''), 'Period:', payslip.get('payroll_period', '')],
-                ['Employee Name:', payslip.get('employee_name', ''), 'Start Date:', str(payslip.get('start_date', ''))],
-                ['Position:', payslip.get('position', ''), 'End Date:', str(payslip.get('end_date', ''))],
-                ['Department:', payslip.get('department', ''), '', ''],
-            ]
-            
-            info_table = Table(info_data, colWidths=[100, 150, 80, 150])
-            info_table.setStyle(TableStyle([
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            elements.append(info_table)
-            elements.append(Spacer(1, 20))
-            
-            # Earnings section
-            elements.append(Paragraph("EARNINGS", ParagraphStyle('SectionHeader', fontSize=12, fontName='Helvetica-Bold', spaceAfter=10)))
-            
-            # Format amounts with peso sign
-            peso_symbol = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
-            basic_pay = float(payslip.get('basic_pay', 0) or 0)
-            overtime_pay = float(payslip.get('overtime_pay', 0) or 0)
-            allowance = float(payslip.get('allowance', 0) or 0)
-            gross_pay = float(payslip.get('gross_pay', 0) or 0)
-            
-            earnings_data = [
-                ['Description', 'Amount'],
-                ['Basic Pay', f"{peso_symbol}{basic_pay:,.2f}"],
-                ['Overtime Pay', f"{peso_symbol}{overtime_pay:,.2f}"],
-                ['Allowance', f"{peso_symbol}{allowance:,.2f}"],
-                ['GROSS PAY', f"{peso_symbol}{gross_pay:,.2f}"],
-            ]
-            
-            earnings_table = Table(earnings_data, colWidths=[300, 150])
-            font_name = 'Helvetica-Bold'  # Use built-in bold font
-            earnings_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), font_name),
-                ('FONTNAME', (0, -1), (-1, -1), font_name),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            elements.append(earnings_table)
-            elements.append(Spacer(1, 20))
-            
-            # Deductions section
-            elements.append(Paragraph("DEDUCTIONS", ParagraphStyle('SectionHeader', fontSize=12, fontName='Helvetica-Bold', spaceAfter=10)))
-            
-            # Format deduction amounts with peso sign
-            peso_symbol = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
-            sss = float(payslip.get('sss_deduction', 0) or 0)
-            philhealth = float(payslip.get('philhealth_deduction', 0) or 0)
-            pagibig = float(payslip.get('pagibig_deduction', 0) or 0)
-            tax = float(payslip.get('tax_deduction', 0) or 0)
-            late = float(payslip.get('late_deduction', 0) or 0)
-            absence = float(payslip.get('absence_deduction', 0) or 0)
-            total_deductions = float(payslip.get('total_deductions', 0) or 0)
-            
-            deductions_data = [
-                ['Description', 'Amount'],
-                ['SSS', f"{peso_symbol}{sss:,.2f}"],
-                ['PhilHealth', f"{peso_symbol}{philhealth:,.2f}"],
-                ['Pag-IBIG', f"{peso_symbol}{pagibig:,.2f}"],
-                ['Tax', f"{peso_symbol}{tax:,.2f}"],
-                ['Late Deduction', f"{peso_symbol}{late:,.2f}"],
-                ['Absence Deduction', f"{peso_symbol}{absence:,.2f}"],
-                ['TOTAL DEDUCTIONS', f"{peso_symbol}{total_deductions:,.2f}"],
-            ]
+        return _render_one(payslip, filename)
+    
+    def generate_payslip_pdf_async(self, payroll_id, employee_id, filename):
+        """
+        Generate individual payslip PDF on a background thread.
+        
+        The payslip is fetched on the calling thread, since the database
+        connection is shared; only the rendering runs in the pool.
+        
+        Args:
+            payroll_id: ID of payroll
+            employee_id: ID of employee
+            filename: Output file path
             
-            deductions_table = Table(deductions_data, colWidths=[300, 150])
-            deductions_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('FONTNAME', (0, 0), (-1, 0), font_name),
-                ('FONTNAME', (0, -1), (-1, -1), font_name),
-                ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            elements.append(deductions_table)
-            elements.append(Spacer(1, 20))
-            
-            # Net pay
-            peso_symbol = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
-            net_pay = float(payslip.get('net_pay', 0) or 0)
-            net_pay_data = [
-                ['NET PAY', f"{peso_symbol}{net_pay:,.2f}"]
-            ]
+        Returns:
+            Future resolving to a boolean indicating success
+        """
+        payslip = None
+        if _ensure_pdf_ready():
+            payslip = self._get_payslip(payroll_id, employee_id)
+        else:
+            print("ReportLab library not installed")
+        
+        if not payslip:
+            future = Future()
+            future.set_result(False)
+            return future
+        
+        return _PDF_POOL.submit(_render_one, payslip, filename)
+    
+    def _get_payslip(self, payroll_id, employee_id):
+        """
+        Get one employee's payslip row.
+        
+        Args:
+            payroll_id: ID of payroll
+            employee_id: ID of employee
             
-            net_pay_table = Table(net_pay_data, colWidths=[300, 150])
-            net_pay_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#27ae60')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.white),
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, -1), 14),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ]))
-            elements.append(net_pay_table)
-            
-            # Footer
-            elements.append(Spacer(1, 40))
-            footer_style = ParagraphStyle('Footer', fontSize=8, alignment=TA_CENTER, textColor=colors.grey)
-            elements.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y %I:%M %p')}", footer_style))
-            elements.append(Paragraph("This is a computer-generated payslip.", footer_style))
+        Returns:
+            Payslip dictionary or None
+        """
+        query = self.PAYSLIP_QUERY + " AND pd.employee_id = %s"
+        return self.db.execute_query(query, (payroll_id, employee_id), fetch_one=True)
+    
+    def generate_payslips_bulk(self, payroll_id, filename):
+        """
+        Generate every payslip of a payroll period into one PDF, one page per employee.
+        
+        Args:
+            payroll_id: ID of payroll
+            filename: Output file path
             
-            doc.build(elements)
+        Returns:
+            Boolean indicating success
+        """
+        if not _ensure_pdf_ready():
+            print("ReportLab library not installed")
+            return False
+        
+        # One query for the whole period instead of one per employee
+        query = self.PAYSLIP_QUERY + " ORDER BY e.last_name, e.first_name"
+        payslips = self.db.execute_query(query, (payroll_id,))
+        
+        if not payslips:
+            return False
+        
+        try:
+            buffer = BytesIO()
+            c = canvas.Canvas(buffer, pagesize=letter)
+            for payslip in payslips:
+                _draw_payslip(c, payslip)
+                c.showPage()
+            c.save()
+            _write_pdf(filename, buffer)
             return True
             
         except Exception as e:
             print(f"Payslip PDF error: {e}")
             return False
     
+    def generate_payslips_parallel(self, payroll_id, out_dir, workers=None):
+        """
+        Generate one payslip PDF per employee of a payroll period, rendering in parallel.
+        
+        Rows are fetched here with a single query; worker processes only
+        draw PDFs and never touch the database.
+        
+        Args:
+            payroll_id: ID of payroll
+            out_dir: Directory for the payslip files
+            workers: Number of worker processes (defaults to the CPU count,
+                at most PAYSLIP_WORKERS)
+            
+        Returns:
+            Number of payslips written
+        """
+        if not _ensure_pdf_ready():
+            print("ReportLab library not installed")
+            return 0
+        
+        query = self.PAYSLIP_QUERY + " ORDER BY e.last_name, e.first_name"
+        payslips = self.db.execute_query(query, (payroll_id,))
+        
+        if not payslips:
+            return 0
+        
+        os.makedirs(out_dir, exist_ok=True)
+        filenames = [
+            os.path.join(out_dir, f"payslip_{payslip.get('employee_code', 'unknown')}_{payroll_id}.pdf")
+            for payslip in payslips
+        ]
+        
+        # Never start more processes than there are payslips to render
+        max_workers = workers or min(PAYSLIP_WORKERS, os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, len(payslips)))
+        
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                return sum(executor.map(_render_one, payslips, filenames, chunksize=8))
+        except Exception as e:
+            print(f"Payslip PDF error: {e}")
+            return 0
+    
     # ==================== DASHBOARD STATISTICS ====================
     
+    # Dashboard queries run through prepared statements, keyed on these strings
+    DASHBOARD_COUNTS_QUERY = """
+        SELECT 
+            (SELECT COUNT(*) FROM employees) as emp_total,
+            (SELECT COALESCE(SUM(status = 'Active'), 0) FROM employees) as emp_active,
+            (SELECT COALESCE(SUM(status = 'Inactive'), 0) FROM employees) as emp_inactive,
+            (SELECT COUNT(*) FROM attendance
+                WHERE attendance_date = %s AND status = 'Present') as present_today,
+            (SELECT COALESCE(SUM(total_net_pay), 0) FROM payroll
+                WHERE start_date >= %s AND start_date < %s
+                AND status IN ('Paid', 'Approved')) as monthly_total,
+            (SELECT COUNT(*) FROM payroll WHERE status = 'Draft') as pending,
+            recent.payroll_id,
+            recent.payroll_period,
+            recent.total_net_pay,
+            recent.status
+        FROM (SELECT 1) as single_row
+        LEFT JOIN (
+            SELECT payroll_id, payroll_period, total_net_pay, status
+            FROM payroll
+            ORDER BY created_at DESC
+            LIMIT 1
+        ) as recent ON TRUE
+    """
+    
+    WEEKLY_ATTENDANCE_QUERY = """
+        SELECT 
+            attendance_date,
+            COUNT(*) as present_count,
+            SUM(overtime_hours > 0) as overtime_count,
+            AVG(hours_worked) as avg_hours
+        FROM attendance
+        WHERE attendance_date BETWEEN %s AND %s AND status = 'Present'
+        GROUP BY attendance_date
+    """
+    
+    # Taxes are 10% of salary (sample calculation); percentages come back NULL
+    # when the month has no payroll amounts
+    PAYROLL_BREAKDOWN_QUERY = """
+        SELECT 
+            salary_total / NULLIF(total, 0) * 100 as salary_pct,
+            bonuses_total / NULLIF(total, 0) * 100 as bonuses_pct,
+            taxes_total / NULLIF(total, 0) * 100 as taxes_pct,
+            deductions_total / NULLIF(total, 0) * 100 as deductions_pct
+        FROM (
+            SELECT 
+                salary_total, bonuses_total, taxes_total, deductions_total,
+                salary_total + bonuses_total + taxes_total + deductions_total as total
+            FROM (
+                SELECT 
+                    COALESCE(SUM(basic_pay), 0) as salary_total,
+                    COALESCE(SUM(overtime_pay), 0) as bonuses_total,
+                    COALESCE(SUM(total_deductions), 0) as deductions_total,
+                    GREATEST(COALESCE(SUM(basic_pay), 0), 0) * 0.10 as taxes_total
+                FROM payroll_details pd
+                JOIN payroll p ON pd.payroll_id = p.payroll_id
+                WHERE p.start_date >= %s AND p.start_date < %s
+            ) as sums
+        ) as totals
+    """
+    
+    # Sample percentages shown when there is no payroll data for the month
+    SAMPLE_BREAKDOWN = {
+        'salary': 70.0,
+        'bonuses': 15.0,
+        'taxes': 10.0,
+        'deductions': 5.0
+    }
+    
+    # Active employees now, and those already hired by the end of last month
+    EMPLOYEE_COUNT_CHANGE_QUERY = """
+        SELECT 
+            COALESCE(SUM(status = 'Active'), 0) as cur,
+            COALESCE(SUM(status = 'Active' AND (date_hired IS NULL OR date_hired <= %s)), 0) as prev
+        FROM employees
+    """
+    
+    # Paid/Approved totals for this month and last month in one pass
+    PAYROLL_CHANGE_QUERY = """
+        SELECT 
+            COALESCE(SUM(CASE WHEN start_date >= %s
+                THEN total_net_pay ELSE 0 END), 0) as cur,
+            COALESCE(SUM(CASE WHEN start_date < %s
+                THEN total_net_pay ELSE 0 END), 0) as prev
+        FROM payroll
+        WHERE start_date >= %s AND start_date < %s
+        AND status IN ('Paid', 'Approved')
+    """
+    
     def get_dashboard_stats(self):
         """
         Get statistics for dashboard display.
         
+        Built from the cached _get_dashboard_counts row, so it is not cached
+        itself; a failed query is retried on the next call.
+        
         Returns:
             Dictionary with various statistics
         """
+        counts = self._get_dashboard_counts() or {}
+        
         stats = {}
         
         # Employee counts
-        emp_query = """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Active' THEN 1 ELSE 0 END) as active,
-                SUM(CASE WHEN status = 'Inactive' THEN 1 ELSE 0 END) as inactive
-            FROM employees
-        """
-        emp_result = self.db.execute_query(emp_query, fetch_one=True)
         stats['employees'] = {
-            'total': emp_result.get('total', 0) or 0,
-            'active': emp_result.get('active', 0) or 0,
-            'inactive': emp_result.get('inactive', 0) or 0
+            'total': counts.get('emp_total', 0) or 0,
+            'active': counts.get('emp_active', 0) or 0,
+            'inactive': counts.get('emp_inactive', 0) or 0
         }
         
         # Today's attendance
-        today = datetime.now().date()
-        att_query = """
-            SELECT 
-                COUNT(*) as present
-            FROM attendance
-            WHERE attendance_date = %s AND status = 'Present'
-        """
-        att_result = self.db.execute_query(att_query, (today,), fetch_one=True)
         stats['today_attendance'] = {
-            'present': att_result.get('present', 0) or 0,
+            'present': counts.get('present_today', 0) or 0,
             'total_active': stats['employees']['active']
         }
         
         # Recent payroll
-        payroll_query = """
-            SELECT payroll_id, payroll_period, total_net_pay, status
-            FROM payroll
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        payroll_result = self.db.execute_query(payroll_query, fetch_one=True)
-        stats['recent_payroll'] = payroll_result or {}
+        if counts.get('payroll_id') is not None:
+            stats['recent_payroll'] = {
+                'payroll_id': counts['payroll_id'],
+                'payroll_period': counts.get('payroll_period'),
+                'total_net_pay': counts.get('total_net_pay'),
+                'status': counts.get('status')
+            }
+        else:
+            stats['recent_payroll'] = {}
         
         # Monthly totals - only count Paid/Approved payrolls
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-        monthly_query = """
-            SELECT 
-                COALESCE(SUM(total_net_pay), 0) as monthly_total
-            FROM payroll
-            WHERE MONTH(start_date) = %s 
-            AND YEAR(start_date) = %s
-            AND status IN ('Paid', 'Approved')
-        """
-        monthly_result = self.db.execute_query(monthly_query, (current_month, current_year), fetch_one=True)
-        stats['monthly_payroll'] = float(monthly_result.get('monthly_total', 0) or 0)
+        stats['monthly_payroll'] = _f(counts, 'monthly_total')
         
         return stats
-
+    
+    @_ttl_cache(seconds=60)
+    def _get_dashboard_counts(self):
+        """
+        Fetch every dashboard counter, and the most recent payroll, in one query.
+        
+        Returns:
+            Dictionary with the combined dashboard row (None on error, so it is not cached)
+        """
+        today = datetime.now().date()
+        month_start, next_month = _month_bounds(today.year, today.month)
+        return self.db.execute_prepared(
+            self.DASHBOARD_COUNTS_QUERY, (today, month_start, next_month), fetch_one=True
+        )
+    
+    @_ttl_cache(seconds=60)
     def get_weekly_attendance(self):
         """
         Get weekly attendance data for the current week.
@@ -1036,57 +1658,43 @@ class ReportManager:
         days_since_monday = today.weekday()
         monday = today - timedelta(days=days_since_monday)
         
-        # Get data for each day of the week
-        weekly_data = {
-            'days': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
-            'present': [],
-            'overtime': [],
-            'hours_worked': []  # Hours worked per day
-        }
+        # Fixed-size per-day series, filled in by index
+        present = [0] * 7
+        overtime = [0] * 7
+        hours_worked = [0.0] * 7  # Hours worked per day
         
         # Sample hours data (Mon: 8, Tue: 7.5, Wed: 8, Thu: 6, Fri: 8, Sat: 0, Sun: 0)
         sample_hours = [8.0, 7.5, 8.0, 6.0, 8.0, 0.0, 0.0]
         
+        # Present count, overtime count and average hours for every day in one query
+        rows = self.db.execute_prepared(
+            self.WEEKLY_ATTENDANCE_QUERY, (monday, monday + timedelta(days=6))
+        ) or []
+        by_date = {row['attendance_date']: row for row in rows}
+        
         for i in range(7):
-            day_date = monday + timedelta(days=i)
-            
-            # Count present employees
-            present_query = """
-                SELECT COUNT(*) as count
-                FROM attendance
-                WHERE attendance_date = %s AND status = 'Present'
-            """
-            present_result = self.db.execute_query(present_query, (day_date,), fetch_one=True)
-            present_count = present_result.get('count', 0) or 0
-            
-            # Count overtime hours (employees with overtime > 0)
-            overtime_query = """
-                SELECT COUNT(*) as count
-                FROM attendance
-                WHERE attendance_date = %s AND status = 'Present' AND overtime_hours > 0
-            """
-            overtime_result = self.db.execute_query(overtime_query, (day_date,), fetch_one=True)
-            overtime_count = overtime_result.get('count', 0) or 0
-            
-            # Get average hours worked for the day
-            hours_query = """
-                SELECT AVG(hours_worked) as avg_hours
-                FROM attendance
-                WHERE attendance_date = %s AND status = 'Present'
-            """
-            hours_result = self.db.execute_query(hours_query, (day_date,), fetch_one=True)
-            avg_hours = float(hours_result.get('avg_hours', 0) or 0)
+            day = by_date.get(monday + timedelta(days=i)) or {}
+            present_count = day.get('present_count', 0) or 0
+            overtime_count = int(day.get('overtime_count', 0) or 0)
+            avg_hours = _f(day, 'avg_hours')
             
             # Use sample data if no real data available
             if avg_hours == 0 and present_count == 0:
                 avg_hours = sample_hours[i]
             
-            weekly_data['present'].append(present_count)
-            weekly_data['overtime'].append(overtime_count)
-            weekly_data['hours_worked'].append(avg_hours)
+            present[i] = present_count
+            overtime[i] = overtime_count
+            hours_worked[i] = avg_hours
         
-        return weekly_data
+        # Tuples, since cached results are only shallow-copied per call
+        return {
+            'days': _WEEK_DAYS,
+            'present': tuple(present),
+            'overtime': tuple(overtime),
+            'hours_worked': tuple(hours_worked)
+        }
     
+    @_ttl_cache(seconds=60)
     def get_payroll_breakdown(self):
         """
         Get payroll breakdown for current month.
@@ -1097,44 +1705,23 @@ class ReportManager:
         current_month = datetime.now().month
         current_year = datetime.now().year
         
-        # Get payroll details for current month
-        query = """
-            SELECT 
-                COALESCE(SUM(basic_pay), 0) as salary_total,
-                COALESCE(SUM(overtime_pay), 0) as bonuses_total,
-                COALESCE(SUM(total_deductions), 0) as deductions_total
-            FROM payroll_details pd
-            JOIN payroll p ON pd.payroll_id = p.payroll_id
-            WHERE MONTH(p.start_date) = %s AND YEAR(p.start_date) = %s
-        """
-        
-        result = self.db.execute_query(query, (current_month, current_year), fetch_one=True)
-        
-        salary = float(result.get('salary_total', 0) or 0)
-        bonuses = float(result.get('bonuses_total', 0) or 0)
-        deductions = float(result.get('deductions_total', 0) or 0)
-        
-        # Calculate taxes as 10% of salary (sample calculation)
-        taxes = salary * 0.10 if salary > 0 else 0
-        
-        total = salary + bonuses + taxes + deductions
+        # Percentages for the current month, computed by the database
+        result = self.db.execute_prepared(
+            self.PAYROLL_BREAKDOWN_QUERY, _month_bounds(current_year, current_month), fetch_one=True
+        ) or {}
         
-        if total == 0:
-            # Return sample percentages if no data (salary: 70%, bonuses: 15%, taxes: 10%, deductions: 5%)
-            return {
-                'salary': 70.0,
-                'bonuses': 15.0,
-                'taxes': 10.0,
-                'deductions': 5.0
-            }
+        if result.get('salary_pct') is None:
+            # Return sample percentages if no data
+            return dict(self.SAMPLE_BREAKDOWN)
         
         return {
-            'salary': (salary / total) * 100,
-            'bonuses': (bonuses / total) * 100,
-            'taxes': (taxes / total) * 100,
-            'deductions': (deductions / total) * 100
+            'salary': float(result['salary_pct']),
+            'bonuses': float(result['bonuses_pct']),
+            'taxes': float(result['taxes_pct']),
+            'deductions': float(result['deductions_pct'])
         }
     
+    @_ttl_cache(seconds=60)
     def get_employee_count_change(self):
         """
         Get employee count change from last month.
@@ -1146,30 +1733,16 @@ class ReportManager:
         
         today = datetime.now().date()
         first_day_current = today.replace(day=1)
-        first_day_last = (first_day_current - timedelta(days=1)).replace(day=1)
         last_day_last = first_day_current - timedelta(days=1)
         
-        # Count employees active at end of last month
-        last_month_query = """
-            SELECT COUNT(*) as count
-            FROM employees
-            WHERE status = 'Active' 
-            AND (date_hired IS NULL OR date_hired <= %s)
-        """
-        last_month_result = self.db.execute_query(last_month_query, (last_day_last,), fetch_one=True)
-        last_month_count = last_month_result.get('count', 0) or 0
-        
-        # Count employees active now
-        current_query = """
-            SELECT COUNT(*) as count
-            FROM employees
-            WHERE status = 'Active'
-        """
-        current_result = self.db.execute_query(current_query, fetch_one=True)
-        current_count = current_result.get('count', 0) or 0
+        # Active now vs. active at end of last month, in one scan
+        result = self.db.execute_prepared(self.EMPLOYEE_COUNT_CHANGE_QUERY, (last_day_last,), fetch_one=True) or {}
+        current_count = int(result.get('cur', 0) or 0)
+        last_month_count = int(result.get('prev', 0) or 0)
         
         return current_count - last_month_count
     
+    @_ttl_cache(seconds=60)
     def get_payroll_change(self):
         """
         Get payroll change percentage from last month.
@@ -1177,8 +1750,6 @@ class ReportManager:
         Returns:
             Float representing the percentage change
         """
-        from datetime import timedelta
-        
         today = datetime.now().date()
         current_month = today.month
         current_year = today.year
@@ -1191,27 +1762,16 @@ class ReportManager:
             last_month = current_month - 1
             last_year = current_year
         
-        # Current month total (only Paid/Approved)
-        current_query = """
-            SELECT COALESCE(SUM(total_net_pay), 0) as monthly_total
-            FROM payroll
-            WHERE MONTH(start_date) = %s 
-            AND YEAR(start_date) = %s
-            AND status IN ('Paid', 'Approved')
-        """
-        current_result = self.db.execute_query(current_query, (current_month, current_year), fetch_one=True)
-        current_total = float(current_result.get('monthly_total', 0) or 0)
-        
-        # Last month total (only Paid/Approved)
-        last_query = """
-            SELECT COALESCE(SUM(total_net_pay), 0) as monthly_total
-            FROM payroll
-            WHERE MONTH(start_date) = %s 
-            AND YEAR(start_date) = %s
-            AND status IN ('Paid', 'Approved')
-        """
-        last_result = self.db.execute_query(last_query, (last_month, last_year), fetch_one=True)
-        last_total = float(last_result.get('monthly_total', 0) or 0)
+        # Both monthly totals (only Paid/Approved) over one start_date range
+        month_start, next_month = _month_bounds(current_year, current_month)
+        last_month_start = date(last_year, last_month, 1)
+        result = self.db.execute_prepared(
+            self.PAYROLL_CHANGE_QUERY,
+            (month_start, month_start, last_month_start, next_month),
+            fetch_one=True
+        ) or {}
+        current_total = _f(result, 'cur')
+        last_total = _f(result, 'prev')
         
         if last_total == 0:
             return 0.0
@@ -1226,13 +1786,7 @@ class ReportManager:
             Integer count of pending approvals
         """
         # For now, count payrolls in Draft status as pending
-        query = """
-            SELECT COUNT(*) as count
-            FROM payroll
-            WHERE status = 'Draft'
-        """
-        result = self.db.execute_query(query, fetch_one=True)
-        return result.get('count', 0) or 0
+        return (self._get_dashboard_counts() or {}).get('pending', 0) or 0
     
     def generate_dashboard_pdf(self, filename):
         """
@@ -1244,93 +1798,55 @@ class ReportManager:
         Returns:
             Boolean indicating success
         """
-        if not HAS_REPORTLAB:
+        if not _ensure_pdf_ready():
             print("ReportLab not available. Cannot generate PDF.")
             print("Install with: pip install reportlab")
             return False
         
         try:
-            import os
             # Create directory if it doesn't exist
             dir_path = os.path.dirname(filename)
-            if dir_path and not os.path.exists(dir_path):
+            if dir_path:
                 os.makedirs(dir_path, exist_ok=True)
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-            from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-            
-            doc = SimpleDocTemplate(filename, pagesize=letter)
+            
+            # Get dashboard stats
+            stats = self.get_dashboard_stats()
+            weekly_data = self.get_weekly_attendance()
+            breakdown = self.get_payroll_breakdown()
+            pending = self.get_pending_approvals()
+            generated_on = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+            
+            buffer = BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter)
             elements = []
-            styles = getSampleStyleSheet()
             
             # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#0055FF'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            elements.append(Paragraph("Dashboard Report", title_style))
+            elements.append(Paragraph("Dashboard Report", _DASHBOARD_TITLE_STYLE))
             elements.append(Spacer(1, 0.2*inch))
             
             # Date
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                textColor=colors.HexColor('#6B7280'),
-                alignment=TA_CENTER
-            )
-            elements.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", date_style))
+            elements.append(Paragraph(generated_on, _DASHBOARD_DATE_STYLE))
             elements.append(Spacer(1, 0.4*inch))
             
-            # Get dashboard stats
-            stats = self.get_dashboard_stats()
-            weekly_data = self.get_weekly_attendance()
-            breakdown = self.get_payroll_breakdown()
-            
             # Statistics section
-            heading_style = ParagraphStyle(
-                'SectionHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                textColor=colors.HexColor('#111827'),
-                spaceAfter=12,
-                spaceBefore=20
-            )
-            elements.append(Paragraph("Key Statistics", heading_style))
+            elements.append(Paragraph("Key Statistics", _HEADING_STYLE))
             
             # Stats table
             stats_data = [
                 ['Metric', 'Value'],
                 ['Total Employees', str(stats.get('employees', {}).get('active', 0))],
                 ['Present Today', str(stats.get('today_attendance', {}).get('present', 0))],
-                ['Monthly Payroll', f"{'₱' if UNICODE_FONT == 'DejaVuSans' else 'PHP '}{stats.get('monthly_payroll', 0):,.0f}"],
-                ['Pending Approvals', str(self.get_pending_approvals())],
+                ['Monthly Payroll', f"{_PESO}{stats.get('monthly_payroll', 0):,.0f}"],
+                ['Pending Approvals', str(pending)],
             ]
             
             stats_table = Table(stats_data, colWidths=[3*inch, 2*inch])
-            stats_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F9FAFB')]),
-            ]))
+            stats_table.setStyle(_STATS_TABLE_STYLE)
             elements.append(stats_table)
             elements.append(Spacer(1, 0.3*inch))
             
             # Weekly Attendance section
-            elements.append(Paragraph("Weekly Attendance", heading_style))
+            elements.append(Paragraph("Weekly Attendance", _HEADING_STYLE))
             total_hours = sum(weekly_data.get('hours_worked', [0]))
             attendance_data = [
                 ['Day', 'Hours Worked', 'Progress'],
@@ -1342,22 +1858,12 @@ class ReportManager:
             attendance_data.append(['Total', f"{total_hours:.1f}h / 40h", f"{(total_hours/40.0)*100:.0f}%"])
             
             attendance_table = Table(attendance_data, colWidths=[1.5*inch, 2*inch, 1.5*inch])
-            attendance_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ]))
+            attendance_table.setStyle(_WEEKLY_TABLE_STYLE)
             elements.append(attendance_table)
             elements.append(Spacer(1, 0.3*inch))
             
             # Payroll Breakdown section
-            elements.append(Paragraph("Payroll Breakdown", heading_style))
+            elements.append(Paragraph("Payroll Breakdown", _HEADING_STYLE))
             breakdown_data = [
                 ['Category', 'Percentage'],
                 ['Salary', f"{breakdown.get('salary', 70):.1f}%"],
@@ -1367,28 +1873,14 @@ class ReportManager:
             ]
             
             breakdown_table = Table(breakdown_data, colWidths=[3*inch, 2*inch])
-            breakdown_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0055FF')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#E5E7EB')),
-            ]))
+            breakdown_table.setStyle(_BREAKDOWN_TABLE_STYLE)
             elements.append(breakdown_table)
             
             # Build PDF
             doc.build(elements)
-            
-            # Verify file was created
-            if os.path.exists(filename):
-                print(f"Dashboard PDF created successfully: {filename}")
-                return True
-            else:
-                print(f"Error: PDF file was not created at {filename}")
-                return False
+            _write_pdf(filename, buffer)
+            print(f"Dashboard PDF created successfully: {filename}")
+            return True
             
         except PermissionError as e:
             print(f"Permission error generating dashboard PDF: {e}")
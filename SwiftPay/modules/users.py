@@ -3,15 +3,97 @@ SwiftPay User Authentication Module
 Handles user login, registration, and management
 """
 
-import bcrypt
+import atexit
+import hashlib
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
-import sys
 import os
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database.db import db
-from modules.audit_log import audit_logger, AuditLogger
+from workers.passwords import (
+    hash_password as _hash_password,
+    check_password as _check_password,
+    reject_password as _reject_password,
+)
+from .audit_log import audit_logger, AuditLogger
+
+# Holds a SHA-256 of the admin hash that last passed initialize_admin, so start-ups
+# with an unchanged hash skip bcrypt (the admin row itself is always queried)
+ADMIN_SENTINEL_FILE = os.path.join(os.path.expanduser('~'), '.swiftpay', 'admin_ok')
+
+# Per-process key for the verified-credential cache; cache keys never hold raw passwords
+_VERIFY_CACHE_SECRET = os.urandom(32)
+
+# Worker processes for bcrypt, so hashing never holds the GIL on the UI thread.
+# Started on first async use (see _bcrypt_pool); login needs only a couple.
+BCRYPT_WORKERS = 2
+_BCRYPT_POOL = None
+_BCRYPT_POOL_LOCK = threading.Lock()
+
+
+def _bcrypt_pool():
+    """
+    Get the bcrypt process pool, starting it on first use.
+    
+    Returns:
+        ProcessPoolExecutor shut down at interpreter exit
+    """
+    global _BCRYPT_POOL
+    if _BCRYPT_POOL is None:
+        with _BCRYPT_POOL_LOCK:
+            if _BCRYPT_POOL is None:
+                pool = ProcessPoolExecutor(max_workers=BCRYPT_WORKERS)
+                atexit.register(pool.shutdown, cancel_futures=True)
+                _BCRYPT_POOL = pool
+    return _BCRYPT_POOL
+
+
+def _admin_hash_fingerprint(hashed_password):
+    """Fingerprint a stored admin hash for the sentinel file"""
+    return hashlib.sha256(hashed_password.encode('utf-8')).hexdigest()
+
+
+def _read_admin_sentinel():
+    """
+    Read the admin sentinel file.
+    
+    Returns:
+        Fingerprint of the last verified admin hash, or None if missing
+    """
+    try:
+        with open(ADMIN_SENTINEL_FILE, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _touch_admin_sentinel(hashed_password=None):
+    """Record that the default admin account was just checked"""
+    try:
+        os.makedirs(os.path.dirname(ADMIN_SENTINEL_FILE), exist_ok=True)
+        with open(ADMIN_SENTINEL_FILE, 'w', encoding='utf-8') as f:
+            if hashed_password:
+                f.write(_admin_hash_fingerprint(hashed_password))
+    except OSError:
+        pass
+
+
+def _clear_admin_sentinel():
+    """Force the next initialize_admin call to check the database again"""
+    try:
+        os.remove(ADMIN_SENTINEL_FILE)
+    except OSError:
+        pass
+
+
+def _done_future(result):
+    """Return a Future that already holds result"""
+    future = Future()
+    future.set_result(result)
+    return future
 
 
 class UserManager:
@@ -20,10 +102,71 @@ class UserManager:
     Implements secure password hashing using bcrypt.
     """
     
+    # Successful bcrypt checks are remembered briefly so repeat checks skip bcrypt
+    VERIFY_CACHE_TTL = 30
+    VERIFY_CACHE_SIZE = 1024
+    
+    # Hot statements run as server-side prepared statements (see Database.execute_prepared)
+    LOGIN_USER_QUERY = """
+        SELECT user_id, username, password_hash, full_name, role, status
+        FROM users
+        WHERE username = %s AND status = 'Active'
+    """
+    
+    USER_BY_ID_QUERY = """
+        SELECT user_id, username, full_name, role, status, created_at
+        FROM users
+        WHERE user_id = %s
+    """
+    
+    SET_PASSWORD_QUERY = "UPDATE users SET password_hash = %s WHERE user_id = %s"
+    
+    DEACTIVATE_USER_QUERY = "UPDATE users SET status = 'Inactive' WHERE user_id = %s"
+    
+    # An existing username is a no-op update, so the row count only counts new users
+    CREATE_USER_QUERY = """
+        INSERT INTO users (username, password_hash, full_name, role, status)
+        VALUES (%s, %s, %s, %s, 'Active')
+        ON DUPLICATE KEY UPDATE user_id = user_id
+    """
+    
+    # User list queries for get_all_users
+    ALL_USERS_QUERY = """
+        SELECT user_id, username, full_name, role, status, created_at
+        FROM users
+        ORDER BY full_name
+    """
+    
+    ACTIVE_USERS_QUERY = """
+        SELECT user_id, username, full_name, role, status, created_at
+        FROM users
+        WHERE status = 'Active'
+        ORDER BY full_name
+    """
+    
+    # get_user_by_id rows are reused for this many seconds; writes here invalidate them
+    USER_CACHE_TTL = 5
+    
     def __init__(self):
         """Initialize UserManager with database connection"""
         self.db = db
         self.current_user = None
+        # Set with current_user at login so is_admin is a plain attribute read
+        self._is_admin = False
+        self._verify_cache = OrderedDict()
+        # Pool callbacks record verified checks from another thread
+        self._verify_lock = threading.Lock()
+        # user_id -> (row, expires)
+        self._user_cache = {}
+        # (connection, user_id) last written to @current_user_id
+        self._audit_binding = None
+        # Set by initialize_database once trg_users_audit_create exists; until
+        # then user creation is audited from Python (see _log_user_created)
+        self.audit_trigger = False
+        # Hash of a random password, checked when no user matches (see _reject_unknown)
+        self._dummy_hash_value = None
+        # bcrypt cost factor - can be set via environment variable
+        self.cost = int(os.getenv('SWIFTPAY_BCRYPT_COST', '12'))
     
     def hash_password(self, password):
         """
@@ -35,9 +178,53 @@ class UserManager:
         Returns:
             Hashed password string
         """
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        return _hash_password(password, self.cost)
+    
+    def hash_password_async(self, password):
+        """
+        Hash a password in the bcrypt process pool.
+        
+        Args:
+            password: Plain text password
+            
+        Returns:
+            Future resolving to the hashed password string
+        """
+        return _bcrypt_pool().submit(_hash_password, password, self.cost)
+    
+    def _verify_cache_key(self, password, hashed_password):
+        """Build the verified-credential cache key for a password/hash pair"""
+        # Keyed on the stored hash too, so a changed password never hits an old entry.
+        # Keyed BLAKE2b is a one-pass MAC, cheaper than HMAC-SHA256 on this hot path
+        return hashlib.blake2b(
+            f"{hashed_password}\0{password}".encode('utf-8'),
+            key=_VERIFY_CACHE_SECRET,
+            digest_size=32
+        ).digest()
+    
+    def _is_verified(self, key):
+        """Check the verified-credential cache, dropping the entry if expired"""
+        with self._verify_lock:
+            expires = self._verify_cache.get(key)
+            if expires is None:
+                return False
+            if time.monotonic() < expires:
+                self._verify_cache.move_to_end(key)
+                return True
+            del self._verify_cache[key]
+            return False
+    
+    def _remember_verified(self, key):
+        """Record a successful bcrypt check in the verified-credential cache"""
+        with self._verify_lock:
+            self._verify_cache[key] = time.monotonic() + self.VERIFY_CACHE_TTL
+            if len(self._verify_cache) > self.VERIFY_CACHE_SIZE:
+                self._verify_cache.popitem(last=False)
+    
+    def _clear_verified(self):
+        """Forget every cached password check"""
+        with self._verify_lock:
+            self._verify_cache.clear()
     
     def verify_password(self, password, hashed_password):
         """
@@ -50,12 +237,102 @@ class UserManager:
         Returns:
             Boolean indicating if password matches
         """
+        key = self._verify_cache_key(password, hashed_password)
+        if self._is_verified(key):
+            return True
+        
+        matches = _check_password(password, hashed_password)
+        if matches:
+            self._remember_verified(key)
+        return matches
+    
+    def verify_password_async(self, password, hashed_password):
+        """
+        Verify a password in the bcrypt process pool.
+        
+        A successful check is cached, so a following verify_password call
+        with the same password returns without running bcrypt again.
+        
+        Args:
+            password: Plain text password to verify
+            hashed_password: Stored password hash
+            
+        Returns:
+            Future resolving to a boolean indicating if password matches
+        """
+        key = self._verify_cache_key(password, hashed_password)
+        if self._is_verified(key):
+            return _done_future(True)
+        
+        def _record(future):
+            if not future.cancelled() and future.exception() is None and future.result():
+                self._remember_verified(key)
+        
+        future = _bcrypt_pool().submit(_check_password, password, hashed_password)
+        future.add_done_callback(_record)
+        return future
+    
+    def _reject_unknown(self, password):
+        """
+        Spend one bcrypt operation on a password whose user does not exist.
+        
+        The work matches a real check, so timing does not reveal which
+        usernames exist. The first call builds the dummy hash, which costs
+        the same as checking against it; later calls check against it.
+        
+        Args:
+            password: Plain text password that was supplied
+            
+        Returns:
+            False
+        """
+        if self._dummy_hash_value is None:
+            self._dummy_hash_value = _hash_password(os.urandom(16).hex(), self.cost)
+            return False
+        return _reject_password(password, self._dummy_hash_value)
+    
+    def _reject_unknown_async(self, password):
+        """
+        Run _reject_unknown's bcrypt work in the process pool.
+        
+        Args:
+            password: Plain text password that was supplied
+            
+        Returns:
+            Future resolving to False
+        """
+        if self._dummy_hash_value is not None:
+            return _bcrypt_pool().submit(_reject_password, password, self._dummy_hash_value)
+        
+        rejected = Future()
+        
+        def _store(future):
+            if future.cancelled():
+                rejected.cancel()
+                return
+            error = future.exception()
+            if error is not None:
+                rejected.set_exception(error)
+                return
+            self._dummy_hash_value = future.result()
+            rejected.set_result(False)
+        
+        _bcrypt_pool().submit(_hash_password, os.urandom(16).hex(), self.cost).add_done_callback(_store)
+        return rejected
+    
+    def needs_rehash(self, hashed_password):
+        """
+        Check whether a stored hash was made with a different bcrypt cost.
+        
+        Args:
+            hashed_password: Stored password hash ($2b$<cost>$...)
+            
+        Returns:
+            Boolean indicating if the hash should be regenerated
+        """
         try:
-            return bcrypt.checkpw(
-                password.encode('utf-8'), 
-                hashed_password.encode('utf-8')
-            )
-        except Exception:
+            return int(hashed_password.split('$')[2]) != self.cost
+        except (IndexError, ValueError):
             return False
     
     def login(self, username, password):
@@ -69,15 +346,20 @@ class UserManager:
         Returns:
             Dictionary with user info if successful, None otherwise
         """
-        query = """
-            SELECT user_id, username, password_hash, full_name, role, status
-            FROM users
-            WHERE username = %s AND status = 'Active'
-        """
+        user = self._get_login_user(username)
         
-        user = self.db.execute_query(query, (username,), fetch_one=True)
+        if not user:
+            self._reject_unknown(password)
+            return None
         
-        if user and self.verify_password(password, user['password_hash']):
+        if self.verify_password(password, user['password_hash']):
+            # Re-hash with the configured cost while the plain password is at hand
+            if self.needs_rehash(user['password_hash']):
+                self.db.execute_prepared_update(
+                    self.SET_PASSWORD_QUERY,
+                    (self.hash_password(password), user['user_id'])
+                )
+            
             # Remove password hash from returned data
             self.current_user = {
                 'user_id': user['user_id'],
@@ -85,8 +367,9 @@ class UserManager:
                 'full_name': user['full_name'],
                 'role': user['role']
             }
+            self._is_admin = user['role'] == 'Admin'
             # Log login
-            audit_logger.log_user_action(
+            audit_logger.log_user_action_async(
                 user_id=user['user_id'],
                 action_type=AuditLogger.ACTION_LOGIN,
                 entity_type=AuditLogger.ENTITY_USER,
@@ -97,18 +380,53 @@ class UserManager:
         
         return None
     
+    def verify_login_async(self, username, password):
+        """
+        Check login credentials without blocking the caller on bcrypt.
+        
+        The user row is read on the calling thread, since the database
+        connection is shared; only bcrypt runs in the pool. Once the Future
+        resolves to True, login() completes from the cache.
+        
+        Args:
+            username: User's username
+            password: User's password
+            
+        Returns:
+            Future resolving to a boolean indicating if the credentials match
+        """
+        user = self._get_login_user(username)
+        if not user:
+            return self._reject_unknown_async(password)
+        return self.verify_password_async(password, user['password_hash'])
+    
+    def _get_login_user(self, username):
+        """
+        Get the active user row used for login.
+        
+        Args:
+            username: User's username
+            
+        Returns:
+            User dictionary including password_hash, or None
+        """
+        return self.db.execute_prepared(self.LOGIN_USER_QUERY, (username,), fetch_one=True)
+    
     def logout(self):
         """Clear current user session"""
-        if self.current_user:
+        user = self.current_user
+        if user:
             # Log logout
-            audit_logger.log_user_action(
-                user_id=self.current_user.get('user_id'),
+            user_id = user['user_id']
+            audit_logger.log_user_action_async(
+                user_id=user_id,
                 action_type=AuditLogger.ACTION_LOGOUT,
                 entity_type=AuditLogger.ENTITY_USER,
-                entity_id=self.current_user.get('user_id'),
-                description=f"User '{self.current_user.get('username')}' logged out"
+                entity_id=user_id,
+                description=f"User '{user['username']}' logged out"
             )
         self.current_user = None
+        self._is_admin = False
     
     def get_current_user(self):
         """Get currently logged in user"""
@@ -116,7 +434,7 @@ class UserManager:
     
     def is_admin(self):
         """Check if current user is admin"""
-        return self.current_user and self.current_user.get('role') == 'Admin'
+        return self._is_admin
     
     def create_user(self, username, password, full_name, role='Staff'):
         """
@@ -131,37 +449,88 @@ class UserManager:
         Returns:
             New user ID if successful, None otherwise
         """
-        # Check if username already exists
-        existing = self.db.execute_query(
-            "SELECT user_id FROM users WHERE username = %s",
-            (username,),
-            fetch_one=True
-        )
+        hashed = self.hash_password(password)
         
-        if existing:
-            return None
+        # trg_users_audit_create writes the audit entry in the INSERT's transaction
+        if self.audit_trigger:
+            self._bind_audit_user()
         
-        hashed = self.hash_password(password)
+        # One round-trip: an existing username leaves its row untouched and returns None
+        user_id = self.db.execute_insert_new(self.CREATE_USER_QUERY, (username, hashed, full_name, role))
         
-        query = """
-            INSERT INTO users (username, password_hash, full_name, role, status)
-            VALUES (%s, %s, %s, %s, 'Active')
+        if user_id and not self.audit_trigger:
+            self._log_user_created(user_id, username, full_name, role)
+        
+        return user_id
+    
+    def create_users_bulk(self, users):
         """
+        Create many user accounts at once.
         
-        user_id = self.db.execute_insert(query, (username, hashed, full_name, role))
+        Passwords are hashed in parallel in the bcrypt process pool and the
+        rows are sent in one executemany batch. Existing usernames are
+        skipped; the audit trigger records each created user. Without the
+        trigger, rows are inserted one at a time so each new user is logged.
         
-        # Log user creation
-        if user_id and self.current_user:
-            audit_logger.log_user_action(
-                user_id=self.current_user.get('user_id'),
-                action_type=AuditLogger.ACTION_CREATE,
-                entity_type=AuditLogger.ENTITY_USER,
-                entity_id=user_id,
-                description=f"Created new user '{username}' with role '{role}'",
-                new_values={'username': username, 'full_name': full_name, 'role': role}
-            )
+        Args:
+            users: Iterable of dictionaries with username, password,
+                   full_name and optional role (default 'Staff')
+            
+        Returns:
+            Number of users created, or -1 on a database error
+        """
+        users = list(users)
+        if not users:
+            return 0
         
-        return user_id
+        hashes = _bcrypt_pool().map(
+            _hash_password,
+            [user['password'] for user in users],
+            [self.cost] * len(users),
+            chunksize=4
+        )
+        rows = [
+            (user['username'], hashed, user['full_name'], user.get('role', 'Staff'))
+            for user, hashed in zip(users, hashes)
+        ]
+        
+        if not self.audit_trigger:
+            created = 0
+            for row in rows:
+                user_id = self.db.execute_insert_new(self.CREATE_USER_QUERY, row)
+                if user_id:
+                    self._log_user_created(user_id, row[0], row[2], row[3])
+                    created += 1
+            return created
+        
+        self._bind_audit_user()
+        return self.db.execute_many(self.CREATE_USER_QUERY, rows)
+    
+    def _log_user_created(self, user_id, username, full_name, role):
+        """Queue the user-creation audit entry when the users audit trigger is missing"""
+        if not self.current_user:
+            return
+        audit_logger.log_user_action_async(
+            user_id=self.current_user.get('user_id'),
+            action_type=AuditLogger.ACTION_CREATE,
+            entity_type=AuditLogger.ENTITY_USER,
+            entity_id=user_id,
+            description=f"Created new user '{username}' with role '{role}'",
+            new_values={'username': username, 'full_name': full_name, 'role': role}
+        )
+    
+    def _bind_audit_user(self):
+        """
+        Set @current_user_id, read by the users audit trigger, on the current connection.
+        
+        The variable is only re-sent when the user or the connection changed,
+        so a reconnect never leaves the trigger without it.
+        """
+        connection = self.db.connection
+        user_id = self.current_user['user_id'] if self.current_user else None
+        if self._audit_binding != (connection, user_id):
+            self.db.execute_update("SET @current_user_id = %s", (user_id,))
+            self._audit_binding = (connection, user_id)
     
     def update_user(self, user_id, full_name=None, role=None, status=None):
         """
@@ -208,18 +577,27 @@ class UserManager:
         
         result = self.db.execute_update(query, tuple(params))
         
+        new_values = {}
+        if full_name:
+            new_values['full_name'] = full_name
+        if role:
+            new_values['role'] = role
+        if status:
+            new_values['status'] = status
+        
+        if result > 0 and old_user:
+            # Patch the row we already read so the next read skips the database
+            self._user_cache[user_id] = (
+                {**old_user, **new_values},
+                time.monotonic() + self.USER_CACHE_TTL
+            )
+        else:
+            self._user_cache.pop(user_id, None)
+        
         # Log user update
         if result > 0 and self.current_user:
-            new_values = {}
-            if full_name:
-                new_values['full_name'] = full_name
-            if role:
-                new_values['role'] = role
-            if status:
-                new_values['status'] = status
-            
-            audit_logger.log_user_action(
-                user_id=self.current_user.get('user_id'),
+            audit_logger.log_user_action_async(
+                user_id=self.current_user['user_id'],
                 action_type=AuditLogger.ACTION_UPDATE,
                 entity_type=AuditLogger.ENTITY_USER,
                 entity_id=user_id,
@@ -249,19 +627,23 @@ class UserManager:
             fetch_one=True
         )
         
-        if not user or not self.verify_password(old_password, user['password_hash']):
+        if not user:
+            self._reject_unknown(old_password)
+            return False
+        
+        if not self.verify_password(old_password, user['password_hash']):
             return False
         
         # Update with new password
         new_hash = self.hash_password(new_password)
-        result = self.db.execute_update(
-            "UPDATE users SET password_hash = %s WHERE user_id = %s",
-            (new_hash, user_id)
-        )
+        result = self.db.execute_prepared_update(self.SET_PASSWORD_QUERY, (new_hash, user_id))
         
         # Log password change
         if result > 0:
-            audit_logger.log_user_action(
+            self._clear_verified()
+            self._user_cache.pop(user_id, None)
+            _clear_admin_sentinel()
+            audit_logger.log_user_action_async(
                 user_id=user_id,
                 action_type=AuditLogger.ACTION_PASSWORD_CHANGE,
                 entity_type=AuditLogger.ENTITY_USER,
@@ -283,15 +665,17 @@ class UserManager:
             Boolean indicating success
         """
         new_hash = self.hash_password(new_password)
-        result = self.db.execute_update(
-            "UPDATE users SET password_hash = %s WHERE user_id = %s",
-            (new_hash, user_id)
-        )
+        result = self.db.execute_prepared_update(self.SET_PASSWORD_QUERY, (new_hash, user_id))
+        
+        if result > 0:
+            self._clear_verified()
+            self._user_cache.pop(user_id, None)
+            _clear_admin_sentinel()
         
         # Log password reset
         if result > 0 and self.current_user:
-            audit_logger.log_user_action(
-                user_id=self.current_user.get('user_id'),
+            audit_logger.log_user_action_async(
+                user_id=self.current_user['user_id'],
                 action_type=AuditLogger.ACTION_PASSWORD_RESET,
                 entity_type=AuditLogger.ENTITY_USER,
                 entity_id=user_id,
@@ -313,15 +697,17 @@ class UserManager:
         # Get user info before deletion
         user = self.get_user_by_id(user_id)
         
-        result = self.db.execute_update(
-            "UPDATE users SET status = 'Inactive' WHERE user_id = %s",
-            (user_id,)
-        )
+        result = self.db.execute_prepared_update(self.DEACTIVATE_USER_QUERY, (user_id,))
+        
+        if result > 0:
+            self._clear_verified()
+            self._user_cache.pop(user_id, None)
+            _clear_admin_sentinel()
         
         # Log user deletion
         if result > 0 and self.current_user and user:
-            audit_logger.log_user_action(
-                user_id=self.current_user.get('user_id'),
+            audit_logger.log_user_action_async(
+                user_id=self.current_user['user_id'],
                 action_type=AuditLogger.ACTION_DELETE,
                 entity_type=AuditLogger.ENTITY_USER,
                 entity_id=user_id,
@@ -341,21 +727,8 @@ class UserManager:
         Returns:
             List of user dictionaries
         """
-        if include_inactive:
-            query = """
-                SELECT user_id, username, full_name, role, status, created_at
-                FROM users
-                ORDER BY full_name
-            """
-            return self.db.execute_query(query)
-        else:
-            query = """
-                SELECT user_id, username, full_name, role, status, created_at
-                FROM users
-                WHERE status = 'Active'
-                ORDER BY full_name
-            """
-            return self.db.execute_query(query)
+        query = self.ALL_USERS_QUERY if include_inactive else self.ACTIVE_USERS_QUERY
+        return self.db.execute_query(query)
     
     def get_user_by_id(self, user_id):
         """
@@ -367,18 +740,30 @@ class UserManager:
         Returns:
             User dictionary or None
         """
-        query = """
-            SELECT user_id, username, full_name, role, status, created_at
-            FROM users
-            WHERE user_id = %s
-        """
-        return self.db.execute_query(query, (user_id,), fetch_one=True)
+        cached = self._user_cache.get(user_id)
+        if cached is not None:
+            user, expires = cached
+            if time.monotonic() < expires:
+                return dict(user)
+            del self._user_cache[user_id]
+        
+        user = self.db.execute_prepared(self.USER_BY_ID_QUERY, (user_id,), fetch_one=True)
+        if user:
+            self._user_cache[user_id] = (user, time.monotonic() + self.USER_CACHE_TTL)
+            return dict(user)
+        return user
     
     def initialize_admin(self):
         """
         Create default admin user if no admin exists.
         Default credentials: admin / admin123
+        
+        The admin row is always looked up, so a new or recreated database still
+        gets its admin. Only the bcrypt check is skipped, when the stored hash is
+        the one ADMIN_SENTINEL_FILE recorded as passing.
         """
+        sentinel = _read_admin_sentinel()
+        
         # Check if admin user exists
         admin = self.db.execute_query(
             "SELECT user_id, password_hash FROM users WHERE username = 'admin' LIMIT 1",
@@ -387,23 +772,31 @@ class UserManager:
         
         if not admin:
             # Create new admin user
-            self.create_user(
+            if not self.create_user(
                 username='admin',
                 password='admin123',
                 full_name='System Administrator',
                 role='Admin'
-            )
+            ):
+                return True
             print("Default admin user created (admin/admin123)")
-        else:
-            # Verify the password works, if not reset it
-            if not self.verify_password('admin123', admin['password_hash']):
-                new_hash = self.hash_password('admin123')
-                self.db.execute_update(
-                    "UPDATE users SET password_hash = %s, status = 'Active' WHERE username = 'admin'",
-                    (new_hash,)
-                )
-                print("Admin password reset to default (admin/admin123)")
+            _touch_admin_sentinel()
+            return True
+        
+        # A hash that already passed would pass again, so bcrypt only runs on a new hash
+        verified_hash = admin['password_hash']
+        already_verified = sentinel == _admin_hash_fingerprint(verified_hash)
+        
+        # Verify the password works, if not reset it
+        if not already_verified and not self.verify_password('admin123', verified_hash):
+            verified_hash = self.hash_password('admin123')
+            self.db.execute_update(
+                "UPDATE users SET password_hash = %s, status = 'Active' WHERE username = 'admin'",
+                (verified_hash,)
+            )
+            print("Admin password reset to default (admin/admin123)")
         
+        _touch_admin_sentinel(verified_hash)
         return True
 
 
@@ -5,16 +5,22 @@ Time-in/out tracking and attendance records
 
 import sys
 import os
-from datetime import datetime, time, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QFrame, QTableWidget, QTableWidgetItem,
+    QPushButton, QFrame, QTableWidgetItem, QTableView,
     QDialog, QFormLayout, QComboBox, QDateEdit, QTimeEdit,
     QMessageBox, QHeaderView, QScrollArea, QTabWidget,
-    QAbstractItemView, QTextEdit, QGroupBox, QFileDialog
+    QAbstractItemView, QTextEdit, QGroupBox, QFileDialog,
+    QStyledItemDelegate, QToolTip
 )
-from PyQt6.QtCore import Qt, QDate, QTime, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import (
+    Qt, QDate, QTime, QTimer, QSignalBlocker, QAbstractTableModel, QModelIndex, pyqtSignal,
+    QEvent, QRect, QRectF, QSortFilterProxyModel
+)
+from PyQt6.QtGui import QFont, QColor, QPainter
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,12 +29,253 @@ from modules.attendance import attendance_manager
 from modules.employees import employee_manager
 from modules.reports import report_manager
 
+# One background thread for page loads; it keeps its own database connection
+# and runs loads in submission order, so the latest search always lands last
+_LOADER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='AttendanceLoader')
+
+# Attendance statuses, in the order of the attendance.status ENUM
+_STATUSES = ("Present", "Absent", "Half-Day", "Leave")
+
+
+def _td_to_qtime(td):
+    """
+    Convert a MySQL TIME value (returned as timedelta) to a QTime.
+    
+    Args:
+        td: Time of day as a timedelta
+        
+    Returns:
+        QTime with the hours and minutes of td
+    """
+    hours, remainder = divmod(int(td.total_seconds()), 3600)
+    minutes, _ = divmod(remainder, 60)
+    return QTime(hours, minutes)
+
+
+def _fetch_clock_data():
+    """
+    Fetch the clock tab's employees and their attendance for today.
+    
+    Returns:
+        Tuple of ((employee_id, name) choices, today, employee_id -> record or None)
+    """
+    choices = employee_manager.get_active_employee_choices() or []
+    today = datetime.now().date()
+    employee_ids = [employee_id for employee_id, _ in choices]
+    records = attendance_manager.get_attendance_bulk(employee_ids, today)
+    return choices, today, {eid: records.get(eid) for eid in employee_ids}
+
+
+class AttendanceTableModel(QAbstractTableModel):
+    """
+    Read-only model over attendance record dictionaries.
+    
+    Cells are formatted on demand in data(), so the view only touches
+    visible rows instead of holding a QTableWidgetItem for every cell.
+    """
+    
+    COLUMNS = ("Date", "Code", "Employee", "Time In", "Time Out", "Break",
+               "Hours", "OT", "Late", "Status", "Actions")
+    STATUS_COLUMN = 9
+    ACTIONS_COLUMN = 10
+    # Break, Hours, OT and Late sort by value rather than by their text
+    NUMERIC_COLUMNS = (5, 6, 7, 8)
+    # Role the sort proxy compares on
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+    
+    # Status badge colours; anything else (e.g. Half-Day) uses the default
+    STATUS_COLORS = {
+        'Present': QColor('#10B981'),
+        'Absent': QColor('#EF4444'),
+        'Leave': QColor('#3B82F6'),
+    }
+    DEFAULT_STATUS_COLOR = QColor('#F59E0B')
+    STATUS_TEXT_COLOR = QColor('white')
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+    
+    def set_records(self, records):
+        """Replace the model's records"""
+        self.beginResetModel()
+        self.records = list(records or [])
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        rec = self.records[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display_text(rec, column)
+        
+        if role == self.SORT_ROLE:
+            text = self._display_text(rec, column)
+            return float(text) if column in self.NUMERIC_COLUMNS else text
+        
+        if column == self.STATUS_COLUMN:
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return self.STATUS_COLORS.get(rec.get('status', ''), self.DEFAULT_STATUS_COLOR)
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return self.STATUS_TEXT_COLOR
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+        return None
+    
+    def _display_text(self, rec, column):
+        """Format one cell of a record for display"""
+        if column == 0:
+            date = rec.get('attendance_date', '')
+            if isinstance(date, datetime):
+                date = date.strftime('%Y-%m-%d')
+            return str(date)
+        if column == 1:
+            return rec.get('employee_code', '')
+        if column == 2:
+            return rec.get('full_name', '')
+        if column in (3, 4):
+            value = rec.get('time_in' if column == 3 else 'time_out')
+            if not value:
+                return ''
+            if isinstance(value, timedelta):
+                return _td_to_qtime(value).toString('HH:mm')
+            return str(value)[:5]
+        
+        hours_worked = rec.get('hours_worked', 0) or 0
+        if column == 5:
+            # Break minutes: 60 if total hours > 4, otherwise 0
+            return str(60 if hours_worked > 4 else 0)
+        if column == 6:
+            return f"{hours_worked:.2f}"
+        if column == 7:
+            return f"{rec.get('overtime_hours', 0) or 0:.2f}"
+        if column == 8:
+            return str(rec.get('late_minutes', 0) or 0)
+        if column == self.STATUS_COLUMN:
+            return rec.get('status', '')
+        return ''
+
+
+class AttendanceActionsDelegate(QStyledItemDelegate):
+    """
+    Paints the View/Edit/Delete buttons of the records table's Actions column.
+    
+    The buttons are drawn rather than placed as widgets, so a page of records
+    creates no widgets per row; clicks are hit-tested in editorEvent() and
+    reported through action_clicked.
+    """
+    
+    # Emitted with the action ('view', 'edit' or 'delete') and the row as shown in the view
+    action_clicked = pyqtSignal(str, int)
+    
+    # (action, label, tooltip, colour, width) for each button, left to right
+    BUTTONS = (
+        ('view', "👁️ View", "View Details", QColor('#0055FF'), 70),
+        ('edit', "✏️ Edit", "Edit Record", QColor('#F59E0B'), 70),
+        ('delete', "🗑️ Delete", "Delete Record", QColor('#EF4444'), 80),
+    )
+    BUTTON_HEIGHT = 32
+    BUTTON_SPACING = 8
+    MARGIN = 8
+    TEXT_COLOR = QColor('white')
+    
+    @classmethod
+    def preferred_width(cls):
+        """Column width that fits every button at full size"""
+        widths = sum(button[4] for button in cls.BUTTONS)
+        return widths + cls.BUTTON_SPACING * (len(cls.BUTTONS) - 1) + 2 * cls.MARGIN
+    
+    def _button_rects(self, rect):
+        """
+        Lay the buttons out inside a cell, shrinking them if the column is narrow.
+        
+        Args:
+            rect: Cell rectangle
+            
+        Returns:
+            List of (button, QRect) pairs
+        """
+        natural = self.preferred_width() - 2 * self.MARGIN
+        available = rect.width() - 2 * self.MARGIN
+        scale = min(1.0, available / natural)
+        height = min(self.BUTTON_HEIGHT, rect.height() - 8)
+        left = rect.left() + self.MARGIN + max(0, (available - natural) // 2)
+        top = rect.top() + (rect.height() - height) // 2
+        
+        rects = []
+        for button in self.BUTTONS:
+            width = int(button[4] * scale)
+            rects.append((button, QRect(left, top, width, height)))
+            left += width + int(self.BUTTON_SPACING * scale)
+        return rects
+    
+    def _button_at(self, rect, pos):
+        """Return the button under pos in a cell, or None"""
+        for button, button_rect in self._button_rects(rect):
+            if button_rect.contains(pos):
+                return button
+        return None
+    
+    def paint(self, painter, option, index):
+        # Background and selection from the style, then the buttons on top
+        super().paint(painter, option, index)
+        
+        font = QFont(option.font)
+        font.setPixelSize(11)
+        font.setWeight(QFont.Weight.Medium)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(font)
+        for (_, label, _, color, _), rect in self._button_rects(option.rect):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawRoundedRect(QRectF(rect), 6, 6)
+            painter.setPen(self.TEXT_COLOR)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            button = self._button_at(option.rect, event.position().toPoint())
+            if button is not None:
+                self.action_clicked.emit(button[0], index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+    
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            button = self._button_at(option.rect, event.pos())
+            if button is not None:
+                QToolTip.showText(event.globalPos(), button[2], view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
 
 class AttendanceDialog(QDialog):
     """
     Dialog for recording attendance manually.
     """
     
+    # Default shift shown for new records
+    _DEFAULT_TIME_IN = QTime(8, 0)
+    _DEFAULT_TIME_OUT = QTime(17, 0)
+    
     def __init__(self, parent=None, attendance_data=None):
         super().__init__(parent)
         self.attendance_data = attendance_data
@@ -66,7 +313,9 @@ class AttendanceDialog(QDialog):
         
         # Date
         self.date_edit = QDateEdit()
-        self.date_edit.setDate(QDate.currentDate())
+        # Edits get their date from load_attendance_data
+        if not self.is_edit:
+            self.date_edit.setDate(QDate.currentDate())
         self.date_edit.setCalendarPopup(True)
         self.date_edit.setEnabled(not self.is_edit)
         form_layout.addRow("Date:", self.date_edit)
@@ -74,18 +323,18 @@ class AttendanceDialog(QDialog):
         # Time In
         self.time_in = QTimeEdit()
         self.time_in.setDisplayFormat("hh:mm AP")
-        self.time_in.setTime(QTime(8, 0))
+        self.time_in.setTime(self._DEFAULT_TIME_IN)
         form_layout.addRow("Time In:", self.time_in)
         
         # Time Out
         self.time_out = QTimeEdit()
         self.time_out.setDisplayFormat("hh:mm AP")
-        self.time_out.setTime(QTime(17, 0))
+        self.time_out.setTime(self._DEFAULT_TIME_OUT)
         form_layout.addRow("Time Out:", self.time_out)
         
         # Status
         self.status_combo = QComboBox()
-        self.status_combo.addItems(["Present", "Absent", "Half-Day", "Leave"])
+        self.status_combo.addItems(_STATUSES)
         form_layout.addRow("Status:", self.status_combo)
         
         # Remarks
@@ -115,15 +364,26 @@ class AttendanceDialog(QDialog):
         
         layout.addLayout(btn_layout)
     
+    def reset_fields(self):
+        """Clear the form so a reused add dialog starts like a new one"""
+        self.load_employees()
+        self.date_edit.setDate(QDate.currentDate())
+        self.time_in.setTime(self._DEFAULT_TIME_IN)
+        self.time_out.setTime(self._DEFAULT_TIME_OUT)
+        self.status_combo.setCurrentIndex(0)
+        self.remarks.clear()
+    
     def load_employees(self):
         """Load active employees into dropdown"""
-        employees = employee_manager.get_active_employees()
+        choices = employee_manager.get_active_employee_choices()
         self.employee_combo.clear()
+        # employee_id -> combo index, for selecting an employee without scanning
+        self._emp_id_to_index = {}
         
-        if employees:
-            for emp in employees:
-                name = f"{emp.get('employee_code')} - {emp.get('first_name')} {emp.get('last_name')}"
-                self.employee_combo.addItem(name, emp.get('employee_id'))
+        if choices:
+            for index, (employee_id, name) in enumerate(choices):
+                self.employee_combo.addItem(name, employee_id)
+                self._emp_id_to_index[employee_id] = index
     
     def load_attendance_data(self):
         """Load existing attendance data"""
@@ -132,10 +392,9 @@ class AttendanceDialog(QDialog):
         
         # Find and select employee
         emp_id = self.attendance_data.get('employee_id')
-        for i in range(self.employee_combo.count()):
-            if self.employee_combo.itemData(i) == emp_id:
-                self.employee_combo.setCurrentIndex(i)
-                break
+        index = self._emp_id_to_index.get(emp_id)
+        if index is not None:
+            self.employee_combo.setCurrentIndex(index)
         
         # Set date
         date = self.attendance_data.get('attendance_date')
@@ -148,10 +407,7 @@ class AttendanceDialog(QDialog):
         time_in = self.attendance_data.get('time_in')
         if time_in:
             if isinstance(time_in, timedelta):
-                total_seconds = int(time_in.total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                self.time_in.setTime(QTime(hours, minutes))
+                self.time_in.setTime(_td_to_qtime(time_in))
             elif isinstance(time_in, time):
                 self.time_in.setTime(QTime(time_in.hour, time_in.minute))
         
@@ -159,10 +415,7 @@ class AttendanceDialog(QDialog):
         time_out = self.attendance_data.get('time_out')
         if time_out:
             if isinstance(time_out, timedelta):
-                total_seconds = int(time_out.total_seconds())
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                self.time_out.setTime(QTime(hours, minutes))
+                self.time_out.setTime(_td_to_qtime(time_out))
             elif isinstance(time_out, time):
                 self.time_out.setTime(QTime(time_out.hour, time_out.minute))
         
@@ -205,8 +458,9 @@ class AttendanceDialog(QDialog):
                 elif status == 'Leave':
                     attendance_manager.record_leave(employee_id, date, remarks)
                 else:
-                    attendance_manager.time_in(employee_id, time_in, date)
-                    attendance_manager.time_out(employee_id, time_out, date)
+                    attendance_manager.upsert_attendance(
+                        employee_id, date, time_in, time_out, status, remarks
+                    )
                 
                 QMessageBox.information(self, "Success", "Attendance recorded!")
                 self.accept()
@@ -220,8 +474,56 @@ class AttendancePage(QWidget):
     Attendance management page with time-in/out and records view.
     """
     
+    # Emitted from the loader thread with (slot, future); Qt queues it onto the UI thread
+    _loaded = pyqtSignal(object, object)
+    
+    # Most recent (employee_id, date) attendance lookups kept for the clock tab
+    ATTENDANCE_CACHE_SIZE = 128
+    
+    # Quiet time (ms) after the last clock dropdown change before the status refreshes
+    STATUS_DEBOUNCE_MS = 100
+    
+    # Status indicator styles, applied by _set_status only on state changes
+    _STATUS_STYLE = """
+        QLabel {{
+            background-color: {background};
+            color: {color};
+            border-radius: 10px;
+            padding: 16px 28px;
+            font-size: 15px;
+            font-weight: 500;
+            min-height: 48px;
+        }}
+    """
+    _STYLE_IDLE = _STATUS_STYLE.format(background='#FEF3C7', color='#92400E')
+    _STYLE_WORKING = _STATUS_STYLE.format(background='#D1FAE5', color='#065F46')
+    _STYLE_CLOCKED_OUT = _STATUS_STYLE.format(background='#DBEAFE', color='#1E40AF')
+    _STYLE_ERROR = _STATUS_STYLE.format(background='#FEE2E2', color='#991B1B')
+    
     def __init__(self):
         super().__init__()
+        # (employee_id, date) -> attendance record, filled by update_employee_status
+        self._attendance_cache = OrderedDict()
+        # employee_id -> today's record (or None), prefetched in one query by load_clock_employees
+        self._today_attendance = {}
+        self._today_attendance_date = None
+        self._loaded.connect(self._finish_load)
+        # Add dialog, built on first use and reused afterwards
+        self._dialog = None
+        
+        # Restarted on every dropdown change, so scrolling refreshes the status once
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(self.STATUS_DEBOUNCE_MS)
+        self._status_timer.timeout.connect(self.update_employee_status)
+        
+        # Today's date for status lookups, rolled over by a timer at midnight
+        self._today = date.today()
+        self._midnight_timer = QTimer(self)
+        self._midnight_timer.setSingleShot(True)
+        self._midnight_timer.timeout.connect(self._roll_over_day)
+        self._schedule_midnight()
+        
         # Initialize stat cards as None to prevent AttributeError
         self.present_card = None
         self.absent_card = None
@@ -354,17 +656,8 @@ class AttendancePage(QWidget):
         
         # Status Indicator - Centered
         self.status_indicator = QLabel("Select an employee")
-        self.status_indicator.setStyleSheet("""
-            QLabel {
-                background-color: #FEF3C7;
-                color: #92400E;
-                border-radius: 10px;
-                padding: 16px 28px;
-                font-size: 15px;
-                font-weight: 500;
-                min-height: 48px;
-            }
-        """)
+        self.status_indicator.setStyleSheet(self._STYLE_IDLE)
+        self._status_style = self._STYLE_IDLE
         self.status_indicator.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_indicator)
         
@@ -441,7 +734,7 @@ class AttendancePage(QWidget):
         layout.addStretch()
         
         # Connect employee selection changes
-        self.clock_employee.currentIndexChanged.connect(self.update_employee_status)
+        self.clock_employee.currentIndexChanged.connect(lambda _: self._status_timer.start())
         self.load_clock_employees()
         
         return tab
@@ -531,11 +824,8 @@ class AttendancePage(QWidget):
         self.filter_employee = QComboBox()
         self.filter_employee.setMinimumHeight(42)
         self.filter_employee.addItem("All Employees", None)
-        employees = employee_manager.get_active_employees()
-        if employees:
-            for emp in employees:
-                name = f"{emp.get('employee_code')} - {emp.get('first_name')} {emp.get('last_name')}"
-                self.filter_employee.addItem(name, emp.get('employee_id'))
+        for employee_id, name in employee_manager.get_active_employee_choices() or []:
+            self.filter_employee.addItem(name, employee_id)
         self.filter_employee.setStyleSheet("""
             QComboBox {
                 background-color: #FFFFFF;
@@ -622,7 +912,7 @@ class AttendancePage(QWidget):
         layout.addWidget(filter_container)
         
         # Records table
-        self.records_table = QTableWidget()
+        self.records_table = QTableView()
         self.setup_records_table()
         layout.addWidget(self.records_table, 1)
         
@@ -680,10 +970,22 @@ class AttendancePage(QWidget):
     
     def setup_records_table(self):
         """Setup attendance records table"""
-        columns = ["Date", "Code", "Employee", "Time In", "Time Out", "Break", "Hours", "OT", "Late", "Status", "Actions"]
-        
-        self.records_table.setColumnCount(len(columns))
-        self.records_table.setHorizontalHeaderLabels(columns)
+        self._records_model = AttendanceTableModel(self)
+        
+        # Header clicks sort through a proxy; the model keeps records in load order
+        self._records_proxy = QSortFilterProxyModel(self)
+        self._records_proxy.setSourceModel(self._records_model)
+        self._records_proxy.setSortRole(AttendanceTableModel.SORT_ROLE)
+        self.records_table.setModel(self._records_proxy)
+        self.records_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.records_table.setSortingEnabled(True)
+        
+        # Row actions are painted by a delegate instead of a widget per row
+        self._actions_delegate = AttendanceActionsDelegate(self.records_table)
+        self._actions_delegate.action_clicked.connect(self._on_record_action)
+        self.records_table.setItemDelegateForColumn(
+            AttendanceTableModel.ACTIONS_COLUMN, self._actions_delegate
+        )
         
         header = self.records_table.horizontalHeader()
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
@@ -691,21 +993,22 @@ class AttendancePage(QWidget):
         self.records_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.records_table.setAlternatingRowColors(True)
         self.records_table.verticalHeader().setVisible(False)
+        self.records_table.verticalHeader().setDefaultSectionSize(60)
         
         # Improved table styling
         self.records_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #E5E7EB;
                 border-radius: 8px;
                 background-color: white;
                 gridline-color: #F3F4F6;
                 font-size: 10px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px 4px;
                 border: none;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #EFF6FF;
                 color: #1E40AF;
             }
@@ -721,155 +1024,166 @@ class AttendancePage(QWidget):
         """)
         
         # Set Actions column width
-        self.records_table.setColumnWidth(10, 150)
+        self.records_table.setColumnWidth(
+            AttendanceTableModel.ACTIONS_COLUMN, AttendanceActionsDelegate.preferred_width()
+        )
+    
+    def _load_async(self, fetch, slot, *args):
+        """Run fetch(*args) on the loader thread and hand its Future to slot on the UI thread"""
+        future = _LOADER_POOL.submit(fetch, *args)
+        future.add_done_callback(lambda f: self._loaded.emit(slot, f))
+    
+    def _finish_load(self, slot, future):
+        """Deliver a finished background load to its slot"""
+        slot(future)
     
     def load_clock_employees(self):
         """Load employees for clock dropdown"""
-        self.clock_employee.clear()
-        employees = employee_manager.get_active_employees()
+        self._load_async(_fetch_clock_data, self._populate_clock_employees)
+    
+    def _populate_clock_employees(self, future):
+        """Fill the clock dropdown once employees and today's records are loaded"""
+        # Today's records are prefetched so selecting an employee needs no query
+        try:
+            choices, today, records = future.result()
+            self._today_attendance = records
+            self._today_attendance_date = today
+        except Exception as e:
+            choices = []
+            self._today_attendance = {}
+            self._today_attendance_date = None
+            print(f"Error loading clock employees: {e}")
         
-        if employees:
-            for emp in employees:
-                name = f"{emp.get('employee_code')} - {emp.get('first_name')} {emp.get('last_name')}"
-                self.clock_employee.addItem(name, emp.get('employee_id'))
+        # Refill silently; the status is updated once for the final selection
+        blocker = QSignalBlocker(self.clock_employee)
+        try:
+            self.clock_employee.clear()
+            for employee_id, name in choices:
+                self.clock_employee.addItem(name, employee_id)
+        finally:
+            blocker.unblock()
         
-        # Update status for first employee (only if widgets exist)
-        if self.clock_employee.count() > 0 and hasattr(self, 'status_indicator'):
-            self.update_employee_status()
+        self.update_employee_status()
     
     def update_employee_status(self):
         """Update status indicator and button states for selected employee"""
+        # Called directly after clock in/out; drop any pending debounced refresh
+        self._status_timer.stop()
+        
         # Check if status_indicator exists (may not be initialized yet)
         if not hasattr(self, 'status_indicator') or self.status_indicator is None:
             return
         
         employee_id = self.clock_employee.currentData()
         if not employee_id:
-            self.status_indicator.setText("Select an employee")
-            self.status_indicator.setStyleSheet("""
-                QLabel {
-                    background-color: #FEF3C7;
-                    color: #92400E;
-                    border-radius: 10px;
-                    padding: 16px 28px;
-                    font-size: 15px;
-                    font-weight: 500;
-                    min-height: 48px;
-                }
-            """)
-            # Hide all buttons if no employee selected
-            if hasattr(self, 'clock_in_btn'):
-                self.clock_in_btn.setEnabled(False)
-            if hasattr(self, 'clock_out_btn'):
-                self.clock_out_btn.hide()
-            if hasattr(self, 'clock_in_btn'):
-                self.clock_in_btn.show()
+            self._set_status("Select an employee", self._STYLE_IDLE)
+            # Only Clock In is shown, disabled, if no employee selected
+            self._set_clock_buttons(clock_in=True, clock_in_enabled=False, clock_out=False)
             return
         
         try:
-            today = datetime.now().date()
-            attendance = attendance_manager.get_attendance(employee_id, today)
+            attendance = self._get_cached_attendance(employee_id, self._today)
             
             if not attendance or not attendance.get('time_in'):
                 # Not clocked in - Show "Not Clocked In" status and Clock In button
-                self.status_indicator.setText("Not Clocked In")
-                self.status_indicator.setStyleSheet("""
-                    QLabel {
-                        background-color: #FEF3C7;
-                        color: #92400E;
-                        border-radius: 10px;
-                        padding: 16px 28px;
-                        font-size: 15px;
-                        font-weight: 500;
-                        min-height: 48px;
-                    }
-                """)
-                # Show Clock In button, hide Clock Out button
-                if hasattr(self, 'clock_in_btn'):
-                    self.clock_in_btn.setEnabled(True)
-                    self.clock_in_btn.show()
-                if hasattr(self, 'clock_out_btn'):
-                    self.clock_out_btn.hide()
+                self._set_status("Not Clocked In", self._STYLE_IDLE)
+                self._set_clock_buttons(clock_in=True, clock_in_enabled=True, clock_out=False)
                     
             elif attendance.get('time_in') and not attendance.get('time_out'):
-                # Clocked in - Show "Currently Working" status and Break/Clock Out buttons
-                time_in = attendance.get('time_in')
-                if isinstance(time_in, timedelta):
-                    total_seconds = int(time_in.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    time_str = f"{hours:02d}:{minutes:02d}"
-                else:
-                    time_str = str(time_in)[:5]
-                
-                self.status_indicator.setText("Currently Working")
-                self.status_indicator.setStyleSheet("""
-                    QLabel {
-                        background-color: #D1FAE5;
-                        color: #065F46;
-                        border-radius: 10px;
-                        padding: 16px 28px;
-                        font-size: 15px;
-                        font-weight: 500;
-                        min-height: 48px;
-                    }
-                """)
-                # Hide Clock In button, show Clock Out button
-                if hasattr(self, 'clock_in_btn'):
-                    self.clock_in_btn.hide()
-                if hasattr(self, 'clock_out_btn'):
-                    self.clock_out_btn.show()
-                    self.clock_out_btn.setEnabled(True)
+                # Clocked in - Show "Currently Working" status and Clock Out button
+                self._set_status("Currently Working", self._STYLE_WORKING)
+                self._set_clock_buttons(clock_in=False, clock_out=True, clock_out_enabled=True)
                     
             else:
                 # Already clocked out
-                time_out = attendance.get('time_out')
-                if isinstance(time_out, timedelta):
-                    total_seconds = int(time_out.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    time_str = f"{hours:02d}:{minutes:02d}"
-                else:
-                    time_str = str(time_out)[:5]
-                
                 hours_worked = attendance.get('hours_worked', 0) or 0
-                self.status_indicator.setText(f"Clocked Out - {hours_worked:.2f} hours worked")
-                self.status_indicator.setStyleSheet("""
-                    QLabel {
-                        background-color: #DBEAFE;
-                        color: #1E40AF;
-                        border-radius: 10px;
-                        padding: 16px 28px;
-                        font-size: 15px;
-                        font-weight: 500;
-                        min-height: 48px;
-                    }
-                """)
+                self._set_status(f"Clocked Out - {hours_worked:.2f} hours worked", self._STYLE_CLOCKED_OUT)
                 # Hide all buttons if already clocked out
-                if hasattr(self, 'clock_in_btn'):
-                    self.clock_in_btn.hide()
-                if hasattr(self, 'clock_out_btn'):
-                    self.clock_out_btn.hide()
+                self._set_clock_buttons(clock_in=False, clock_out=False)
             
         except Exception as e:
-            self.status_indicator.setText("Error loading status")
-            self.status_indicator.setStyleSheet("""
-                QLabel {
-                    background-color: #FEE2E2;
-                    color: #991B1B;
-                    border-radius: 10px;
-                    padding: 16px 28px;
-                    font-size: 15px;
-                    font-weight: 500;
-                    min-height: 48px;
-                }
-            """)
+            self._set_status("Error loading status", self._STYLE_ERROR)
+    
+    def _set_status(self, text, style):
+        """Set the status indicator, re-applying its stylesheet only when the state changes"""
+        self.status_indicator.setText(text)
+        if self._status_style is not style:
+            self.status_indicator.setStyleSheet(style)
+            self._status_style = style
+    
+    def _set_clock_buttons(self, clock_in, clock_out, clock_in_enabled=None, clock_out_enabled=None):
+        """Show/enable the clock buttons, touching only the ones whose state changes"""
+        for name, visible, enabled in (
+            ('clock_in_btn', clock_in, clock_in_enabled),
+            ('clock_out_btn', clock_out, clock_out_enabled),
+        ):
+            button = getattr(self, name, None)
+            if button is None:
+                continue
+            if enabled is not None and button.isEnabled() != enabled:
+                button.setEnabled(enabled)
+            if button.isHidden() == visible:
+                button.setVisible(visible)
+    
+    def _schedule_midnight(self):
+        """Arm the rollover timer for just after the next midnight"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        # One second of slack so date.today() has already changed when it fires
+        self._midnight_timer.start(int((midnight - now).total_seconds() * 1000) + 1000)
+    
+    def _roll_over_day(self):
+        """Switch to the new day and reload the clock tab for it"""
+        self._today = date.today()
+        self._schedule_midnight()
+        self.load_clock_employees()
+        self.load_today_attendance()
+    
+    def _get_cached_attendance(self, employee_id, day):
+        """
+        Get an employee's attendance record for a day, reusing recent lookups.
+        
+        Args:
+            employee_id: ID of employee
+            day: Attendance date
+            
+        Returns:
+            Attendance record dictionary or None
+        """
+        if day == self._today_attendance_date and employee_id in self._today_attendance:
+            return self._today_attendance[employee_id]
+        
+        key = (employee_id, day)
+        if key in self._attendance_cache:
+            self._attendance_cache.move_to_end(key)
+            return self._attendance_cache[key]
+        
+        attendance = attendance_manager.get_attendance(employee_id, day)
+        self._attendance_cache[key] = attendance
+        if len(self._attendance_cache) > self.ATTENDANCE_CACHE_SIZE:
+            self._attendance_cache.popitem(last=False)
+        return attendance
+    
+    def _forget_attendance(self, employee_id, day):
+        """Drop any cached attendance for an employee on a day"""
+        self._attendance_cache.pop((employee_id, day), None)
+        if day == self._today_attendance_date:
+            self._today_attendance.pop(employee_id, None)
+    
+    def _clear_attendance_cache(self):
+        """Drop all cached attendance records"""
+        self._attendance_cache.clear()
+        self._today_attendance = {}
+        self._today_attendance_date = None
     
     def load_today_attendance(self):
         """Load today's attendance records and update stats (table removed)"""
+        self._load_async(attendance_manager.get_today_attendance, self._show_today_attendance)
+    
+    def _show_today_attendance(self, future):
+        """Update stats from a finished today's attendance load"""
         try:
-            records = attendance_manager.get_today_attendance()
-            self.update_attendance_stats(records)
+            self.update_attendance_stats(future.result())
         except Exception as e:
             print(f"Error loading today's attendance: {e}")
     
@@ -1093,6 +1407,7 @@ class AttendancePage(QWidget):
                 
                 from ui.components import show_toast
                 show_toast(self, f"Already timed in at {time_in_str}", "warning", duration=4000)
+                self._forget_attendance(employee_id, today)
                 self.update_employee_status()
                 return
             
@@ -1119,6 +1434,7 @@ class AttendancePage(QWidget):
                 )
                 
                 # Refresh data and update display
+                self._forget_attendance(employee_id, today)
                 records = attendance_manager.get_today_attendance()
                 self.update_attendance_stats(records)
                 self.update_employee_status()
@@ -1162,6 +1478,7 @@ class AttendancePage(QWidget):
             if not existing or not existing.get('time_in'):
                 from ui.components import show_toast
                 show_toast(self, "No time in record found", "error", duration=4000)
+                self._forget_attendance(employee_id, today)
                 self.update_employee_status()
                 return
             
@@ -1179,6 +1496,7 @@ class AttendancePage(QWidget):
                 hours_worked = existing.get('hours_worked', 0) or 0
                 from ui.components import show_toast
                 show_toast(self, f"Already timed out at {time_out_str}", "warning", duration=4000)
+                self._forget_attendance(employee_id, today)
                 self.update_employee_status()
                 return
             
@@ -1238,6 +1556,7 @@ class AttendancePage(QWidget):
                 show_toast(self, toast_msg, "success", duration=5000)
                 
                 # Refresh data and update display
+                self._forget_attendance(employee_id, today)
                 records = attendance_manager.get_today_attendance()
                 self.update_attendance_stats(records)
                 self.update_employee_status()
@@ -1260,9 +1579,16 @@ class AttendancePage(QWidget):
         start = self.start_date.date().toPyDate()
         end = self.end_date.date().toPyDate()
         
+        self._load_async(
+            attendance_manager.get_attendance_by_date_range,
+            self._show_search_results,
+            employee_id, start, end
+        )
+    
+    def _show_search_results(self, future):
+        """Populate the records table from a finished search"""
         try:
-            records = attendance_manager.get_attendance_by_date_range(employee_id, start, end)
-            self.populate_records_table(records)
+            self.populate_records_table(future.result())
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Search failed: {str(e)}")
     
@@ -1505,200 +1831,33 @@ class AttendancePage(QWidget):
     
     def populate_records_table(self, records):
         """Populate attendance records table"""
-        self.records_table.setRowCount(0)
-        
-        if not records:
+        # One model reset relayouts the view in a single pass
+        self._records_model.set_records(records)
+    
+    def _on_record_action(self, action, row):
+        """Run a View/Edit/Delete click from the records table's Actions column"""
+        source = self._records_proxy.mapToSource(self._records_proxy.index(row, 0))
+        if not source.isValid():
             return
-        
-        for row, rec in enumerate(records):
-            self.records_table.insertRow(row)
-            
-            # Date
-            date = rec.get('attendance_date', '')
-            if isinstance(date, datetime):
-                date = date.strftime('%Y-%m-%d')
-            self.records_table.setItem(row, 0, QTableWidgetItem(str(date)))
-            
-            self.records_table.setItem(row, 1, QTableWidgetItem(rec.get('employee_code', '')))
-            self.records_table.setItem(row, 2, QTableWidgetItem(rec.get('full_name', '')))
-            
-            # Times
-            time_in = rec.get('time_in')
-            if time_in:
-                if isinstance(time_in, timedelta):
-                    total_seconds = int(time_in.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    time_in = f"{hours:02d}:{minutes:02d}"
-                else:
-                    time_in = str(time_in)[:5]
-            self.records_table.setItem(row, 3, QTableWidgetItem(time_in or ''))
-            
-            time_out = rec.get('time_out')
-            if time_out:
-                if isinstance(time_out, timedelta):
-                    total_seconds = int(time_out.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    time_out = f"{hours:02d}:{minutes:02d}"
-                else:
-                    time_out = str(time_out)[:5]
-            self.records_table.setItem(row, 4, QTableWidgetItem(time_out or ''))
-            
-            # Calculate break minutes (60 minutes if total hours > 4, otherwise 0)
-            hours_worked = rec.get('hours_worked', 0) or 0
-            break_minutes = 60 if hours_worked > 4 else 0
-            self.records_table.setItem(row, 5, QTableWidgetItem(str(break_minutes)))
-            
-            self.records_table.setItem(row, 6, QTableWidgetItem(f"{hours_worked:.2f}"))
-            self.records_table.setItem(row, 7, QTableWidgetItem(f"{rec.get('overtime_hours', 0) or 0:.2f}"))
-            self.records_table.setItem(row, 8, QTableWidgetItem(str(rec.get('late_minutes', 0) or 0)))
-            
-            # Status - Modern badge widget
-            status = rec.get('status', '')
-            status_widget = QWidget()
-            status_layout = QHBoxLayout(status_widget)
-            status_layout.setContentsMargins(5, 2, 5, 2)
-            status_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            status_label = QLabel(status)
-            status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            # Modern badge styling based on status
-            if status == 'Present':
-                status_label.setStyleSheet("""
-                    QLabel {
-                        background-color: #10B981;
-                        color: white;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 11px;
-                        font-weight: 600;
-                        min-width: 70px;
-                    }
-                """)
-            elif status == 'Absent':
-                status_label.setStyleSheet("""
-                    QLabel {
-                        background-color: #EF4444;
-                        color: white;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 11px;
-                        font-weight: 600;
-                        min-width: 70px;
-                    }
-                """)
-            elif status == 'Leave':
-                status_label.setStyleSheet("""
-                    QLabel {
-                        background-color: #3B82F6;
-                        color: white;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 11px;
-                        font-weight: 600;
-                        min-width: 70px;
-                    }
-                """)
-            else:
-                status_label.setStyleSheet("""
-                    QLabel {
-                        background-color: #F59E0B;
-                        color: white;
-                        border-radius: 12px;
-                        padding: 6px 14px;
-                        font-size: 11px;
-                        font-weight: 600;
-                        min-width: 70px;
-                    }
-                """)
-            
-            status_layout.addWidget(status_label)
-            self.records_table.setCellWidget(row, 9, status_widget)
-            
-            # Actions - Improved with modern styling
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(8, 4, 8, 4)
-            actions_layout.setSpacing(8)
-            actions_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            # View/Details button
-            view_btn = QPushButton("👁️ View")
-            view_btn.setFixedSize(70, 32)
-            view_btn.setToolTip("View Details")
-            view_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            view_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #0055FF;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-size: 11px;
-                    font-weight: 500;
-                    padding: 4px 8px;
-                }
-                QPushButton:hover {
-                    background-color: #0033CC;
-                }
-            """)
-            view_btn.clicked.connect(lambda checked, r=rec: self.view_attendance_details(r))
-            
-            # Edit button
-            edit_btn = QPushButton("✏️ Edit")
-            edit_btn.setFixedSize(70, 32)
-            edit_btn.setToolTip("Edit Record")
-            edit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #F59E0B;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-size: 11px;
-                    font-weight: 500;
-                    padding: 4px 8px;
-                }
-                QPushButton:hover {
-                    background-color: #D97706;
-                }
-            """)
-            edit_btn.clicked.connect(lambda checked, r=rec: self.edit_attendance(r))
-            
-            # Delete button
-            delete_btn = QPushButton("🗑️ Delete")
-            delete_btn.setFixedSize(80, 32)
-            delete_btn.setToolTip("Delete Record")
-            delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #EF4444;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    font-size: 11px;
-                    font-weight: 500;
-                    padding: 4px 8px;
-                }
-                QPushButton:hover {
-                    background-color: #DC2626;
-                }
-            """)
-            delete_btn.clicked.connect(lambda checked, r=rec: self.delete_attendance(r))
-            
-            actions_layout.addWidget(view_btn)
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addStretch()
-            
-            self.records_table.setCellWidget(row, 10, actions_widget)
-            self.records_table.setRowHeight(row, 60)  # Increased for better spacing
+        rec = self._records_model.records[source.row()]
+        
+        if action == 'view':
+            self.view_attendance_details(rec)
+        elif action == 'edit':
+            self.edit_attendance(rec)
+        elif action == 'delete':
+            self.delete_attendance(rec)
     
     def add_attendance(self):
         """Open dialog to add attendance"""
-        dialog = AttendanceDialog(self)
+        if self._dialog is None:
+            self._dialog = AttendanceDialog(self)
+        else:
+            # Employees come from the manager's cache, so edits there show up here
+            self._dialog.reset_fields()
+        dialog = self._dialog
         if dialog.exec():
+            self._clear_attendance_cache()
             self.search_attendance()
             # Update stats after adding attendance
             try:
@@ -1788,6 +1947,7 @@ class AttendancePage(QWidget):
         """Open dialog to edit attendance"""
         dialog = AttendanceDialog(self, record)
         if dialog.exec():
+            self._clear_attendance_cache()
             self.search_attendance()
             # Update stats after adding attendance
             try:
@@ -1831,6 +1991,7 @@ class AttendancePage(QWidget):
                     
                     if result:
                         QMessageBox.information(self, "Success", "Attendance record deleted successfully.")
+                        self._clear_attendance_cache()
                         self.search_attendance()
                         self.load_today_attendance()
                     else:
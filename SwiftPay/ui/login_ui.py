@@ -493,9 +493,15 @@ class LoginWindow(QMainWindow):
     """
     
     login_success = pyqtSignal(dict)
+    # Emitted from the bcrypt pool's callback thread; Qt queues it onto the UI thread
+    _login_checked = pyqtSignal(str, str, bool)
+    # Emitted the same way when the check itself failed (e.g. a broken worker pool)
+    _login_error = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
+        self._login_checked.connect(self._finish_login)
+        self._login_error.connect(lambda message: self._login_failed(f"Login error: {message}"))
         self.init_ui()
     
     def init_ui(self):
@@ -824,26 +830,60 @@ class LoginWindow(QMainWindow):
             self.show_error("Please enter both username and password")
             return
         
-        # Attempt login
+        # Attempt login; bcrypt runs in a worker process so the window stays responsive
         self.login_btn.setEnabled(False)
         self.login_btn.setText("Signing in...")
         
         try:
+            future = user_manager.verify_login_async(username, password)
+        except Exception as e:
+            self._login_failed(f"Login error: {str(e)}")
+            return
+        
+        future.add_done_callback(lambda f: self._on_login_checked(f, username, password))
+    
+    def _on_login_checked(self, future, username, password):
+        """Hand the password check result to the UI thread (runs on the pool's thread)"""
+        if future.cancelled():
+            self._login_error.emit("password check was cancelled")
+        elif future.exception() is not None:
+            self._login_error.emit(str(future.exception()))
+        else:
+            self._login_checked.emit(username, password, bool(future.result()))
+    
+    def _finish_login(self, username, password, verified):
+        """Complete the login once the background password check is done"""
+        if not verified:
+            self._login_failed("Invalid username or password")
+            self.password_input.clear()
+            self.password_input.setFocus()
+            return
+        
+        try:
+            # The verified password is cached, so this skips bcrypt
             user = user_manager.login(username, password)
-            
-            if user:
-                self.error_label.hide()
-                self.login_success.emit(user)
-                self.close()
-            else:
-                self.show_error("Invalid username or password")
-                self.password_input.clear()
-                self.password_input.setFocus()
         except Exception as e:
-            self.show_error(f"Login error: {str(e)}")
-        finally:
-            self.login_btn.setEnabled(True)
-            self.login_btn.setText("Sign In")
+            self._login_failed(f"Login error: {str(e)}")
+            return
+        
+        if not user:
+            self._login_failed("Invalid username or password")
+            return
+        
+        self.error_label.hide()
+        self._reset_login_button()
+        self.login_success.emit(user)
+        self.close()
+    
+    def _login_failed(self, message):
+        """Show a login error and re-enable the form"""
+        self.show_error(message)
+        self._reset_login_button()
+    
+    def _reset_login_button(self):
+        """Restore the sign-in button after a login attempt"""
+        self.login_btn.setEnabled(True)
+        self.login_btn.setText("Sign In")
     
     def show_error(self, message):
         """Display error message"""
@@ -76,11 +76,8 @@ class ReportsPage(QWidget):
         emp_label = QLabel("Employee:")
         self.att_employee = QComboBox()
         self.att_employee.addItem("All Employees", None)
-        employees = employee_manager.get_active_employees()
-        if employees:
-            for emp in employees:
-                name = f"{emp.get('employee_code')} - {emp.get('first_name')} {emp.get('last_name')}"
-                self.att_employee.addItem(name, emp.get('employee_id'))
+        for employee_id, name in employee_manager.get_active_employee_choices() or []:
+            self.att_employee.addItem(name, employee_id)
         
         # Date range
         start_label = QLabel("From:")
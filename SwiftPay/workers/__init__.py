@@ -0,0 +1,8 @@
+"""
+SwiftPay Workers Package
+Functions run in worker processes
+
+Spawned workers re-import the module that defines their target function,
+so nothing in this package may import database or modules: doing so
+would open a MySQL connection in every worker process.
+"""
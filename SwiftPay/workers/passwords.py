@@ -0,0 +1,48 @@
+"""
+SwiftPay Password Hashing Workers
+bcrypt helpers that run in the UserManager's process pool
+"""
+
+import bcrypt
+
+
+def hash_password(password, cost):
+    """
+    Hash a password with bcrypt.
+    
+    Args:
+        password: Plain text password
+        cost: bcrypt cost factor
+        
+    Returns:
+        Hashed password string
+    """
+    salt = bcrypt.gensalt(rounds=cost)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password, hashed_password):
+    """
+    Check a password against a bcrypt hash.
+    
+    Args:
+        password: Plain text password (str or UTF-8 bytes)
+        hashed_password: Stored password hash (str or bytes)
+        
+    Returns:
+        Boolean indicating if password matches
+    """
+    try:
+        if isinstance(password, str):
+            password = password.encode('utf-8')
+        if isinstance(hashed_password, str):
+            hashed_password = hashed_password.encode('ascii')
+        return bcrypt.checkpw(password, hashed_password)
+    except Exception:
+        return False
+
+
+def reject_password(password, hashed_password):
+    """Run a full bcrypt check for timing only, then fail"""
+    check_password(password, hashed_password)
+    return False
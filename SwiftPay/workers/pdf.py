@@ -0,0 +1,373 @@
+"""
+SwiftPay PDF Workers
+Payslip drawing shared by ReportManager and its payslip process pool
+"""
+
+import sys
+import os
+import json
+import functools
+import tempfile
+from datetime import datetime
+from io import BytesIO
+
+# ReportLab is imported, and fonts registered, on first use (see ensure_ready)
+HAS_REPORTLAB = False
+UNICODE_FONT = None
+UNICODE_FONT_BOLD = None
+
+# Resolved PDF font paths are cached per platform so later starts skip the path scan
+FONT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.swiftpay', 'fontcache.json')
+
+# Use PHP symbol until a font with the peso sign is registered
+PESO = "PHP "
+
+
+def _load_font_cache():
+    """
+    Read the cached font paths for this platform.
+    
+    Returns:
+        Tuple of (regular_path, bold_path) or None if missing or stale
+    """
+    try:
+        with open(FONT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('platform') == sys.platform and os.path.exists(cached.get('regular', '')):
+            return cached['regular'], cached.get('bold', '')
+    except Exception:
+        pass
+    return None
+
+
+def _save_font_cache(regular_path, bold_path):
+    """
+    Remember the font paths that registered successfully on this platform.
+    
+    Args:
+        regular_path: Path of the regular font file
+        bold_path: Path of the bold font file
+    """
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'platform': sys.platform, 'regular': regular_path, 'bold': bold_path}, f)
+    except Exception:
+        pass
+
+
+def write_pdf(filename, buffer):
+    """
+    Write a rendered PDF to disk in one go, replacing the target atomically.
+    
+    A failed export therefore never leaves a truncated PDF behind. The
+    temporary file gets a unique name in the target directory, so concurrent
+    exports to the same path never share it.
+    
+    Args:
+        filename: Output file path
+        buffer: BytesIO holding the rendered PDF
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(filename) or '.', prefix=os.path.basename(filename), suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(buffer.getbuffer())
+        # mkstemp creates the file owner-only; exports get the usual permissions
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_ready():
+    """
+    Import ReportLab, register fonts and build the payslip colors on first use.
+    
+    Returns:
+        True if ReportLab is available
+    """
+    global HAS_REPORTLAB, UNICODE_FONT, UNICODE_FONT_BOLD, PESO
+    global colors, letter, pdfmetrics, TTFont, canvas
+    
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        return False
+    
+    HAS_REPORTLAB = True
+    
+    # Skip ReportLab's per-shape argument validation; our drawing calls are fixed
+    from reportlab import rl_config
+    rl_config.shapeChecking = 0
+    
+    UNICODE_FONT, UNICODE_FONT_BOLD = _register_fonts()
+    
+    # Use PHP symbol if peso sign not supported by the registered font
+    PESO = "₱" if UNICODE_FONT == 'DejaVuSans' else "PHP "
+    
+    _build_payslip_styles()
+    return True
+
+
+def _font_family(path):
+    """
+    Map a font file path to the ReportLab font name it is registered under.
+    
+    Args:
+        path: Path of the regular font file
+        
+    Returns:
+        Font name, or None if the file is not a supported family
+    """
+    lower_path = path.lower()
+    if 'dejavu' in lower_path:
+        return 'DejaVuSans'
+    if 'arial' in lower_path:
+        return 'Arial'
+    return None
+
+
+def _register_fonts():
+    """
+    Register a Unicode-capable font (for the peso sign) with ReportLab.
+    
+    Returns:
+        Tuple of (font_name, bold_font_name)
+    """
+    # Try common system font paths
+    font_paths = [
+        ('C:/Windows/Fonts/DejaVuSans.ttf', 'C:/Windows/Fonts/DejaVuSans-Bold.ttf'),
+        ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+        ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ]
+    
+    try:
+        # Try the cached paths first; the scan only continues if they fail to register
+        cached_paths = _load_font_cache()
+        if cached_paths:
+            font_paths.insert(0, cached_paths)
+        
+        for regular_path, bold_path in font_paths:
+            font_name = _font_family(regular_path)
+            if not font_name or not os.path.exists(regular_path):
+                continue
+            
+            try:
+                pdfmetrics.registerFont(TTFont(font_name, regular_path))
+            except Exception as e:
+                print(f"Font registration error: {e}")
+                continue
+            
+            # Try to register bold if available; ReportLab falls back to the regular font
+            bold_font_name = f'{font_name}-Bold'
+            if os.path.exists(bold_path):
+                try:
+                    pdfmetrics.registerFont(TTFont(bold_font_name, bold_path))
+                except Exception:
+                    pass
+            
+            if (regular_path, bold_path) != cached_paths:
+                _save_font_cache(regular_path, bold_path)
+            
+            # Only use -Bold suffix if it's actually registered
+            if bold_font_name not in set(pdfmetrics.getRegisteredFontNames()):
+                bold_font_name = font_name
+            return font_name, bold_font_name
+    except Exception as e:
+        print(f"Font setup error: {e}")
+    
+    # If no system font found, use built-in Helvetica
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+def _build_payslip_styles():
+    """Build the colors used when drawing payslips"""
+    global _PAYSLIP_TITLE_COLOR, _EARNINGS_HEADER_COLOR, _DEDUCTIONS_HEADER_COLOR
+    global _TOTAL_ROW_COLOR, _NET_PAY_COLOR
+    
+    _PAYSLIP_TITLE_COLOR = colors.HexColor('#2c3e50')
+    _EARNINGS_HEADER_COLOR = colors.HexColor('#3498db')
+    _DEDUCTIONS_HEADER_COLOR = colors.HexColor('#e74c3c')
+    _TOTAL_ROW_COLOR = colors.HexColor('#ecf0f1')
+    _NET_PAY_COLOR = colors.HexColor('#27ae60')
+
+
+def format_amount(value):
+    """
+    Format an amount as currency using the peso sign when the PDF font has it.
+    
+    Args:
+        value: Amount (None counts as zero)
+        
+    Returns:
+        Formatted string, e.g. "₱1,234.50"
+    """
+    return f"{PESO}{float(value or 0):,.2f}"
+
+
+def draw_payslip(c, payslip):
+    """
+    Draw one payslip on the current page of a canvas.
+    
+    The payslip has a fixed layout, so it is drawn at known coordinates
+    instead of going through ReportLab's flowable layout.
+    
+    Args:
+        c: ReportLab canvas
+        payslip: Payslip row (payroll detail joined with payroll and employee)
+    """
+    center = letter[0] / 2
+    
+    # Company header
+    c.setFillColor(_PAYSLIP_TITLE_COLOR)
+    c.setFont('Helvetica-Bold', 20)
+    c.drawCentredString(center, 740, "SwiftPay")
+    c.setFillColor(colors.black)
+    c.setFont('Helvetica', 14)
+    c.drawCentredString(center, 715, "PAYSLIP")
+    
+    # Employee info
+    info_rows = [
+        ('Employee Code:', payslip.get('employee_code', ''), 'Period:', payslip.get('payroll_period', '')),
+        ('Employee Name:', f"{payslip.get('first_name', '')} {payslip.get('last_name', '')}", 'Start Date:', payslip.get('start_date', '')),
+        ('Position:', payslip.get('position', ''), 'End Date:', payslip.get('end_date', '')),
+        ('Department:', payslip.get('department', ''), '', ''),
+    ]
+    left = center - 240
+    y = 680
+    for label, value, label2, value2 in info_rows:
+        c.setFont('Helvetica-Bold', 10)
+        c.drawString(left, y, label)
+        c.drawString(left + 250, y, label2)
+        c.setFont(UNICODE_FONT, 10)
+        c.drawString(left + 100, y, str(value or ''))
+        c.drawString(left + 330, y, str(value2 or ''))
+        y -= 18
+    
+    # Earnings section
+    y = _draw_amount_table(c, y - 20, "EARNINGS", _EARNINGS_HEADER_COLOR, [
+        ('Basic Pay', payslip.get('basic_pay')),
+        ('Overtime Pay', payslip.get('overtime_pay')),
+        ('Allowance', payslip.get('allowance')),
+        ('GROSS PAY', payslip.get('gross_pay')),
+    ])
+    
+    # Deductions section
+    y = _draw_amount_table(c, y - 30, "DEDUCTIONS", _DEDUCTIONS_HEADER_COLOR, [
+        ('SSS', payslip.get('sss_deduction')),
+        ('PhilHealth', payslip.get('philhealth_deduction')),
+        ('Pag-IBIG', payslip.get('pagibig_deduction')),
+        ('Tax', payslip.get('tax_deduction')),
+        ('Late Deduction', payslip.get('late_deduction')),
+        ('Absence Deduction', payslip.get('absence_deduction')),
+        ('TOTAL DEDUCTIONS', payslip.get('total_deductions')),
+    ])
+    
+    # Net pay
+    left = center - 225
+    y -= 50
+    c.setFillColor(_NET_PAY_COLOR)
+    c.rect(left, y, 450, 30, stroke=0, fill=1)
+    c.setFillColor(colors.white)
+    c.setFont('Helvetica-Bold', 14)
+    c.drawString(left + 6, y + 10, "NET PAY")
+    c.setFont(UNICODE_FONT_BOLD, 14)
+    c.drawRightString(left + 444, y + 10, format_amount(payslip.get('net_pay')))
+    
+    # Footer
+    c.setFillColor(colors.grey)
+    c.setFont('Helvetica', 8)
+    c.drawCentredString(center, y - 40, f"Generated on {datetime.now().strftime('%B %d, %Y %I:%M %p')}")
+    c.drawCentredString(center, y - 52, "This is a computer-generated payslip.")
+
+
+def render_payslip(payslip, filename):
+    """
+    Render one payslip to its own PDF file.
+    
+    Runs in the payslip process pool as well as on the caller's thread;
+    each worker process registers fonts once on its first call.
+    
+    Args:
+        payslip: Payslip row (payroll detail joined with payroll and employee)
+        filename: Output file path
+        
+    Returns:
+        Boolean indicating success
+    """
+    if not ensure_ready():
+        return False
+    
+    try:
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter)
+        draw_payslip(c, payslip)
+        c.showPage()
+        c.save()
+        write_pdf(filename, buffer)
+        return True
+    except Exception as e:
+        print(f"Payslip PDF error: {e}")
+        return False
+
+
+def _draw_amount_table(c, top, title, header_color, rows):
+    """
+    Draw a titled Description/Amount table whose last row is the total.
+    
+    Args:
+        c: ReportLab canvas
+        top: Y coordinate of the section title
+        title: Section title
+        header_color: Background color of the header row
+        rows: (description, amount) pairs, total last
+        
+    Returns:
+        Y coordinate of the bottom of the table
+    """
+    left = letter[0] / 2 - 225
+    row_height = 22
+    table_top = top - 12
+    bottom = table_top - (len(rows) + 1) * row_height
+    
+    c.setFillColor(colors.black)
+    c.setFont('Helvetica-Bold', 12)
+    c.drawString(left, top, title)
+    
+    # Header and total row backgrounds, then the grid
+    c.setFillColor(header_color)
+    c.rect(left, table_top - row_height, 450, row_height, stroke=0, fill=1)
+    c.setFillColor(_TOTAL_ROW_COLOR)
+    c.rect(left, bottom, 450, row_height, stroke=0, fill=1)
+    c.setStrokeColor(colors.grey)
+    c.setLineWidth(0.5)
+    c.grid([left, left + 300, left + 450],
+           [table_top - i * row_height for i in range(len(rows) + 2)])
+    
+    y = table_top - row_height + 7
+    c.setFillColor(colors.white)
+    c.setFont('Helvetica-Bold', 10)
+    c.drawString(left + 6, y, 'Description')
+    c.drawRightString(left + 444, y, 'Amount')
+    
+    c.setFillColor(colors.black)
+    last = len(rows) - 1
+    for i, (description, amount) in enumerate(rows):
+        y -= row_height
+        c.setFont('Helvetica-Bold' if i == last else 'Helvetica', 10)
+        c.drawString(left + 6, y, description)
+        c.setFont(UNICODE_FONT_BOLD if i == last else UNICODE_FONT, 10)
+        c.drawRightString(left + 444, y, format_amount(amount))
+    
+    return bottom